@@ -0,0 +1,256 @@
+"""
+Local Parts Catalog.
+
+This module gives the impact stage fast access to a large local pricing and
+inventory catalog. A CSV catalog is indexed once into a SQLite file next to it
+(keyed by MPN, WITHOUT ROWID) and the index is reused while the CSV keeps the
+path, size and modification time recorded in the index, so each run only
+performs point lookups for the MPNs that appear in a diff instead of re-reading
+millions of rows.
+
+A SQLite catalog can be used directly; it must contain a `parts` table with the
+columns `mpn`, `unit_cost` and `stock` (see _SCHEMA).
+"""
+import csv
+import math
+import os
+import re
+import sqlite3
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+SQLITE_MAGIC = b"SQLite format 3\0"
+
+# Number of rows sent to SQLite per executemany() call while indexing a CSV.
+INDEX_BATCH_SIZE = 5000
+# Number of MPNs bound per "IN (...)" lookup query (below SQLite's parameter limit).
+LOOKUP_CHUNK_SIZE = 500
+# Suffix of the SQLite index built next to a CSV catalog.
+INDEX_SUFFIX = ".catalog.sqlite"
+
+# Map common variations of catalog column names to the indexed columns.
+CATALOG_COLUMN_ALIASES = {
+    "mpn": ["mpn", "part number", "manufacturer part number", "mfg part number"],
+    "unit_cost": ["unit cost", "unit price", "price", "cost"],
+    "stock": ["stock", "in stock", "quantity available", "qty available", "available", "inventory"],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    mpn       TEXT PRIMARY KEY,
+    unit_cost REAL,     -- NULL when the catalog has no usable price
+    stock     INTEGER   -- NULL when the catalog has no stock information
+) WITHOUT ROWID;
+"""
+
+# The identity of the CSV an index was built from (a single row).
+_SOURCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_source (
+    path     TEXT NOT NULL,     -- absolute path of the CSV
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+class CatalogEntry(NamedTuple):
+    """The pricing and availability of one MPN."""
+    mpn: str
+    unit_cost: Optional[float]
+    stock: Optional[int]
+
+class CatalogSource(NamedTuple):
+    """Identity of the CSV file a catalog index was built from."""
+    path: str
+    size: int
+    mtime_ns: int
+
+def _source_of(csv_path: str) -> CatalogSource:
+    stat = os.stat(csv_path)
+    return CatalogSource(os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns)
+
+# A price or stock cell: an optional sign, currency symbol or ISO code (before
+# or after the number), digits with optional comma thousands separators, an
+# optional fraction and an optional exponent.
+_NUMBER_RE = re.compile(
+    r"""
+    ^(?P<sign>[-+])?
+    (?:[$€£¥]|[A-Z]{3}(?=[\s\d.+-]))?\s*
+    (?P<currency_sign>[-+])?
+    (?P<digits>\d{1,3}(?:,\d{3})+|\d+)?
+    (?P<fraction>\.\d*)?
+    (?P<exponent>[eE][-+]?\d+)?
+    \s*(?:[$€£¥]|[A-Z]{3})?$
+    """,
+    re.VERBOSE
+)
+
+def _parse_number(value: str) -> Optional[float]:
+    """Parses a price or stock cell such as "$1,234.50" or "1.2E-3"; returns None if unusable."""
+    match = _NUMBER_RE.match((value or "").strip())
+    if match is None or (match.group("sign") and match.group("currency_sign")):
+        return None
+    mantissa = (match.group("digits") or "").replace(",", "") + (match.group("fraction") or "")
+    if not any(char.isdigit() for char in mantissa):
+        return None
+    sign = match.group("sign") or match.group("currency_sign") or ""
+    number = float(sign + mantissa + (match.group("exponent") or ""))
+    return number if math.isfinite(number) else None
+
+def _catalog_columns(header: List[str]) -> Dict[str, int]:
+    """Maps the indexed columns to their positions in a CSV header row."""
+    columns = {}
+    for position, column in enumerate(header):
+        column_clean = column.lower().strip()
+        for key, aliases in CATALOG_COLUMN_ALIASES.items():
+            if column_clean in aliases and key not in columns:
+                columns[key] = position
+                break
+    return columns
+
+def build_catalog_index(csv_path: str, index_path: str) -> int:
+    """
+    Indexes a CSV catalog into a SQLite lookup file.
+
+    The index is written to a temporary path and moved into place, so readers
+    never observe a partially built index. For a duplicated MPN the last row wins.
+    The CSV's path, size and modification time (taken before it is read) are
+    recorded in the index's `index_source` table.
+
+    Args:
+        csv_path: The CSV catalog, with a header row naming at least the MPN column.
+        index_path: The path of the SQLite index to create.
+
+    Returns:
+        The number of indexed MPNs.
+
+    Raises:
+        ValueError: If the CSV header has no recognizable MPN column.
+    """
+    temp_path = f"{index_path}.tmp{os.getpid()}"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    source = _source_of(csv_path)
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SCHEMA + _SOURCE_SCHEMA)
+        with open(csv_path, newline='', encoding='utf-8-sig', errors='replace') as f, conn:
+            reader = csv.reader(f)
+            columns = _catalog_columns(next(reader, []))
+            if "mpn" not in columns:
+                raise ValueError(f"No MPN column found in catalog header: {csv_path}")
+
+            batch = []
+            for row in reader:
+                values = {key: row[position].strip() if position < len(row) else "" for key, position in columns.items()}
+                if not values["mpn"]:
+                    continue
+                stock = _parse_number(values.get("stock", ""))
+                batch.append((
+                    values["mpn"],
+                    _parse_number(values.get("unit_cost", "")),
+                    int(stock) if stock is not None else None
+                ))
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    conn.executemany("INSERT OR REPLACE INTO parts (mpn, unit_cost, stock) VALUES (?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT OR REPLACE INTO parts (mpn, unit_cost, stock) VALUES (?, ?, ?)", batch)
+            conn.execute("INSERT INTO index_source (path, size, mtime_ns) VALUES (?, ?, ?)", source)
+        count = conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+    except Exception:
+        conn.close()
+        os.remove(temp_path)
+        raise
+    conn.close()
+    os.replace(temp_path, index_path)
+    return count
+
+class PartsCatalog:
+    """
+    Read-only point lookups into an indexed parts catalog.
+
+    Usage:
+        with open_catalog("parts.csv") as catalog:
+            entries = catalog.lookup_many(["LM358DR", "BAT54S"])
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            self._conn.execute("SELECT mpn, unit_cost, stock FROM parts LIMIT 1")
+        except sqlite3.DatabaseError:
+            self._conn.close()
+            raise ValueError(f"Not a parts catalog (expected a 'parts' table): {db_path}")
+
+    def lookup(self, mpn: str) -> Optional[CatalogEntry]:
+        """Returns the catalog entry of an MPN, or None if it is not listed."""
+        row = self._conn.execute("SELECT mpn, unit_cost, stock FROM parts WHERE mpn = ?", (mpn,)).fetchone()
+        return CatalogEntry(*row) if row else None
+
+    def lookup_many(self, mpns: Iterable[str]) -> Dict[str, CatalogEntry]:
+        """Looks up several MPNs; MPNs that are not listed are left out of the result."""
+        mpns = list(dict.fromkeys(mpns))
+        entries = {}
+        for start in range(0, len(mpns), LOOKUP_CHUNK_SIZE):
+            chunk = mpns[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self._conn.execute(
+                f"SELECT mpn, unit_cost, stock FROM parts WHERE mpn IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in rows:
+                entries[row[0]] = CatalogEntry(*row)
+        return entries
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _is_sqlite(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+
+def _index_matches_source(index_path: str, csv_path: str) -> bool:
+    """Checks whether an index was built from the current contents of a CSV catalog."""
+    if not os.path.exists(index_path):
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT path, size, mtime_ns FROM index_source").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False  # Unreadable, or built before the source was recorded.
+    return row is not None and CatalogSource(*row) == _source_of(csv_path)
+
+def open_catalog(catalog_path: str, index_path: Optional[str] = None) -> PartsCatalog:
+    """
+    Opens a parts catalog for point lookups.
+
+    SQLite catalogs are opened as they are. A CSV catalog is indexed on first
+    use, and again whenever its path, size or modification time differs from
+    the ones recorded in the index (an older copy restored with `cp -p` is
+    detected too).
+
+    Args:
+        catalog_path: A CSV catalog or a SQLite catalog with a `parts` table.
+        index_path: Where to keep the index of a CSV catalog. Defaults to the
+            CSV path with a ".catalog.sqlite" suffix.
+    """
+    if _is_sqlite(catalog_path):
+        return PartsCatalog(catalog_path)
+
+    index_path = index_path or catalog_path + INDEX_SUFFIX
+    if not _index_matches_source(index_path, catalog_path):
+        build_catalog_index(catalog_path, index_path)
+    return PartsCatalog(index_path)
@@ -5,10 +5,96 @@ This module provides the function to compare a master BOM list against a target
 BOM list. It identifies differences based on the Manufacturer Part Number (MPN)
 as the unique key.
 """
-from typing import List, Dict, Any
+from collections.abc import Mapping, Sequence
+from typing import List, Dict, Iterator, Optional, Tuple, Union
 from .models import BOMItem
+from .result import ComparisonResult, Status
+from .snapshot import BOMSnapshot
+from .mpn_matcher import find_likely_renamed, DEFAULT_SIMILARITY_THRESHOLD
+from .description import classify_description_difference, COSMETIC
 
-def compare_boms(master_list: List[BOMItem], target_list: List[BOMItem]) -> Dict[str, Any]:
+DESCRIPTION_MODES = ("exact", "semantic")
+
+# Flags that make an item mismatched (a cosmetic description difference does not).
+MISMATCH_FLAGS = Status.DIFF_QUANTITY | Status.DIFF_DESCRIPTION | Status.DIFF_REFDES
+
+def _index_by_mpn(items: Union[List[BOMItem], Mapping]) -> Tuple[Sequence, Dict[str, int]]:
+    """
+    Returns the items as a sequence together with a map from MPN to position.
+
+    For a duplicated MPN the last line wins.
+    """
+    if isinstance(items, BOMSnapshot):
+        return items.records, {mpn.decode("utf-8"): record_number for mpn, record_number in items.iter_index()}
+    if isinstance(items, Mapping):
+        items = list(items.values())
+    return items, {item['MPN']: position for position, item in enumerate(items)}
+
+def _merge_with_snapshot(
+    snapshot: BOMSnapshot, target_index: Dict[str, int]
+) -> Iterator[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    Merge-joins a snapshot's sorted MPN index with the sorted target MPNs.
+
+    MPNs are compared as UTF-8 bytes straight from the memory map (the same
+    order as sorting the strings), so only master MPNs missing from the target
+    are decoded and no per-comparison map of the master is built.
+    """
+    targets = sorted((mpn.encode("utf-8"), mpn) for mpn in target_index)
+    targets.append((None, None))  # Sentinel: no more target MPNs.
+    position = 0
+    next_bytes, next_mpn = targets[0]
+    for mpn_bytes, record_number in snapshot.iter_index():
+        while next_bytes is not None and next_bytes < mpn_bytes:
+            yield next_mpn, None, target_index[next_mpn]
+            position += 1
+            next_bytes, next_mpn = targets[position]
+        if next_bytes == mpn_bytes:
+            yield next_mpn, record_number, target_index[next_mpn]
+            position += 1
+            next_bytes, next_mpn = targets[position]
+        else:
+            yield mpn_bytes.decode("utf-8"), record_number, None
+    for _, target_mpn in targets[position:-1]:
+        yield target_mpn, None, target_index[target_mpn]
+
+def _merge_by_mpn(
+    master_index: Dict[str, int], target_index: Dict[str, int]
+) -> Iterator[Tuple[str, Optional[int], Optional[int]]]:
+    """Yields (mpn, master_position, target_position) for every MPN, sorted by MPN."""
+    for mpn in sorted(master_index.keys() | target_index.keys()):
+        yield mpn, master_index.get(mpn), target_index.get(mpn)
+
+def _field_differences(master_item: BOMItem, target_item: BOMItem, description_mode: str) -> Status:
+    """Returns the DIFF_*/COSMETIC_DESCRIPTION flags of two items describing the same part."""
+    status = Status(0)
+
+    # 1. Detect quantity mismatch.
+    if master_item['Quantity'] != target_item['Quantity']:
+        status |= Status.DIFF_QUANTITY
+
+    # 2. Detect description differences.
+    if master_item['Description'] != target_item['Description']:
+        if description_mode == "semantic" and classify_description_difference(
+            master_item['Description'], target_item['Description']
+        ) == COSMETIC:
+            status |= Status.COSMETIC_DESCRIPTION
+        else:
+            status |= Status.DIFF_DESCRIPTION
+
+    # 3. Detect differences in Reference Designators.
+    if set(master_item['RefDes']) != set(target_item['RefDes']):
+        status |= Status.DIFF_REFDES
+
+    return status
+
+def compare_boms(
+    master_list: Union[List[BOMItem], Mapping],
+    target_list: Union[List[BOMItem], Mapping],
+    fuzzy_mpn: bool = False,
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    description_mode: str = "exact",
+) -> ComparisonResult:
     """
     Compares a master and target list of BOM items.
 
@@ -19,82 +105,95 @@ def compare_boms(master_list: List[BOMItem], target_list: List[BOMItem]) -> Dict
     - Missing (present in master but not in target)
     - Extra (present in target but not in master)
     - Mismatched (present in both but with different data)
+    - Likely Renamed (only when `fuzzy_mpn` is enabled; a missing and an extra
+      item whose MPNs differ only by case, separators or a close spelling).
+      A renamed pair is also checked for the mismatches below.
 
     Mismatched items are further broken down by the type of discrepancy. Note that
     a single item can appear in multiple mismatch lists if it has more than one
     difference (e.g., both quantity and description are different).
 
+    In "semantic" description mode, descriptions are compared on their
+    normalized attributes (category, values in base units, remaining words).
+    Differences that do not change the part (abbreviations, unit spelling,
+    extra detail) are listed under "cosmetic_description" and do not on their
+    own make an item mismatched.
+
     Args:
-        master_list: A list of BOMItem dictionaries for the master BOM.
-        target_list: A list of BOMItem dictionaries for the target BOM.
+        master_list: A list of BOMItem dictionaries for the master BOM, or a
+            mapping from MPN to BOMItem (e.g. a BOMSnapshot).
+        target_list: A list of BOMItem dictionaries for the target BOM, or a
+            mapping from MPN to BOMItem.
+        fuzzy_mpn: If True, reconcile missing and extra items whose MPNs are
+            probably the same part and report them as "likely_renamed".
+        similarity_threshold: The minimum n-gram similarity (0-1) for two MPNs
+            to be reported as a likely rename.
+        description_mode: "exact" to flag any difference in the Description
+            strings, or "semantic" to separate cosmetic differences from real
+            value changes.
 
     Returns:
-        A dictionary containing the structured comparison results.
+        A ComparisonResult with one record per MPN. Its category views (and
+        to_dict()) provide the lists described above; to_dict() only includes
+        "likely_renamed" and "cosmetic_description" when the option producing
+        them is enabled.
     """
-    # Use dictionaries for efficient O(1) lookups by MPN.
-    master_map = {item['MPN']: item for item in master_list}
-    target_map = {item['MPN']: item for item in target_list}
-
-    master_mpns = set(master_map.keys())
-    target_mpns = set(target_map.keys())
-
-    # Find MPNs that are unique to each BOM.
-    missing_mpns = master_mpns - target_mpns
-    extra_mpns = target_mpns - master_mpns
-    
-    # Find MPNs that are common to both BOMs for detailed comparison.
-    common_mpns = master_mpns & target_mpns
-
-    # Initialize the structure for the comparison results.
-    comparison_result = {
-        "missing_items": [master_map[mpn] for mpn in missing_mpns],
-        "extra_items": [target_map[mpn] for mpn in extra_mpns],
-        "mismatched_quantity": [],
-        "mismatched_description": [],
-        "mismatched_refdes": [],
-        "matched": []
-    }
-
-    # Iterate through common items to find matches and mismatches.
-    for mpn in common_mpns:
-        master_item = master_map[mpn]
-        target_item = target_map[mpn]
-        is_mismatched = False
-
-        # 1. Detect quantity mismatch.
-        if master_item['Quantity'] != target_item['Quantity']:
-            is_mismatched = True
-            comparison_result['mismatched_quantity'].append({
-                'MPN': mpn,
-                'master_item': master_item,
-                'target_item': target_item
-            })
-
-        # 2. Detect description differences.
-        if master_item['Description'] != target_item['Description']:
-            is_mismatched = True
-            comparison_result['mismatched_description'].append({
-                'MPN': mpn,
-                'master_item': master_item,
-                'target_item': target_item
-            })
-
-        # 3. Detect differences in Reference Designators.
-        master_refdes = set(master_item['RefDes'])
-        target_refdes = set(target_item['RefDes'])
-
-        if master_refdes != target_refdes:
-            is_mismatched = True
-            comparison_result['mismatched_refdes'].append({
-                'MPN': mpn,
-                'master_item': master_item,
-                'target_item': target_item,
-                'added_refdes': sorted(list(target_refdes - master_refdes)),
-                'removed_refdes': sorted(list(master_refdes - target_refdes))
-            })
-
-        # 4. If no mismatches were found, the item is a perfect match.
-        if not is_mismatched:
-            comparison_result['matched'].append(master_item)
+    if description_mode not in DESCRIPTION_MODES:
+        raise ValueError(f"Unknown description mode: '{description_mode}'")
+
+    # Map each target MPN to the position of its item for efficient O(1) lookups.
+    target_items, target_index = _index_by_mpn(target_list)
+    if isinstance(master_list, BOMSnapshot):
+        # A shared memory-mapped master is joined in place, never copied.
+        master_items = master_list.records
+        merged = _merge_with_snapshot(master_list, target_index)
+    else:
+        master_items, master_index = _index_by_mpn(master_list)
+        merged = _merge_by_mpn(master_index, target_index)
+
+    optional_categories = []
+    if fuzzy_mpn:
+        optional_categories.append("likely_renamed")
+    if description_mode == "semantic":
+        optional_categories.append("cosmetic_description")
+    comparison_result = ComparisonResult(master_items, target_items, optional_categories)
+
+    # Visit every MPN once, in sorted order, so the result never needs re-sorting.
+    for mpn, master_position, target_position in merged:
+        if target_position is None:
+            comparison_result.add(mpn, master_position, None, Status.MISSING)
+            continue
+
+        if master_position is None:
+            comparison_result.add(mpn, None, target_position, Status.EXTRA)
+            continue
+
+        status = _field_differences(master_items[master_position], target_items[target_position], description_mode)
+
+        # If no mismatches were found, the item is a perfect match.
+        if not status & MISMATCH_FLAGS:
+            status |= Status.MATCHED
+
+        comparison_result.add(mpn, master_position, target_position, status)
+
+    # Reconcile missing/extra pairs that probably refer to the same part.
+    if fuzzy_mpn:
+        missing = [record for record in comparison_result if record.status == Status.MISSING]
+        extra = [record for record in comparison_result if record.status == Status.EXTRA]
+        if missing and extra:
+            pairs = find_likely_renamed(
+                [comparison_result.master_item(record) for record in missing],
+                [comparison_result.target_item(record) for record in extra],
+                similarity_threshold
+            )
+            for master_item, target_item, similarity in pairs:
+                master_record = comparison_result.lookup(master_item['MPN'])
+                target_record = comparison_result.lookup(target_item['MPN'])
+                # A renamed part is still checked field by field against its new MPN.
+                status = Status.LIKELY_RENAMED | _field_differences(master_item, target_item, description_mode)
+                comparison_result.add(
+                    master_record.mpn, master_record.master_index, target_record.target_index, status, similarity
+                )
+                comparison_result.remove(target_record.mpn)
 
     return comparison_result
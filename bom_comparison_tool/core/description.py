@@ -0,0 +1,210 @@
+"""
+Semantic Description Normalization.
+
+This module reduces free-text BOM descriptions to a set of comparable attributes
+so that "Resistor 10k 1%" and "RES 10K OHM 1% 0603" are recognised as the same
+part described differently. Values are canonicalized to base SI units, and common
+abbreviations are expanded to a single spelling.
+
+Normalization results are memoized in a bounded LRU cache because the same
+descriptions repeat across BOMs and across target files.
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+# Maximum number of distinct descriptions kept in the normalization cache.
+DESCRIPTION_CACHE_SIZE = 8192
+
+# Difference classes returned by classify_description_difference().
+COSMETIC = "cosmetic"
+CHANGED = "changed"
+
+# Map common abbreviations to a single canonical word.
+ABBREVIATIONS = {
+    "RES": "RESISTOR", "RESISTOR": "RESISTOR", "RESISTORS": "RESISTOR",
+    "CAP": "CAPACITOR", "CAPS": "CAPACITOR", "CAPACITOR": "CAPACITOR", "CAPACITORS": "CAPACITOR",
+    "IND": "INDUCTOR", "INDUCTOR": "INDUCTOR", "INDUCTORS": "INDUCTOR",
+    "XTAL": "CRYSTAL", "CRYSTAL": "CRYSTAL", "OSC": "OSCILLATOR", "OSCILLATOR": "OSCILLATOR",
+    "CONN": "CONNECTOR", "CONNECTOR": "CONNECTOR",
+    "DIO": "DIODE", "DIODE": "DIODE",
+    "TRANS": "TRANSISTOR", "TRANSISTOR": "TRANSISTOR",
+    "SMT": "SMD", "SMD": "SMD",
+    "TOL": "TOLERANCE", "TOLERANCE": "TOLERANCE",
+    "CER": "CERAMIC", "CERAMIC": "CERAMIC",
+}
+
+# Component categories and the unit implied by a bare prefixed value ("10k").
+CATEGORY_UNITS = {
+    "RESISTOR": "OHM",
+    "CAPACITOR": "F",
+    "INDUCTOR": "H",
+    "CRYSTAL": "HZ",
+    "OSCILLATOR": "HZ",
+}
+
+UNIT_ALIASES = {
+    "Ω": "OHM", "OHM": "OHM", "OHMS": "OHM",
+    "F": "F", "FARAD": "F", "FARADS": "F",
+    "H": "H", "HENRY": "H",
+    "HZ": "HZ",
+    "V": "V", "VDC": "V", "VOLT": "V", "VOLTS": "V",
+    "A": "A", "AMP": "A", "AMPS": "A",
+    "W": "W", "WATT": "W", "WATTS": "W",
+    "%": "%",
+    "PPM": "PPM",
+}
+
+SI_PREFIXES = {
+    "p": 1e-12, "P": 1e-12,
+    "n": 1e-9, "N": 1e-9,
+    "u": 1e-6, "U": 1e-6, "µ": 1e-6, "μ": 1e-6,
+    "m": 1e-3,
+    "k": 1e3, "K": 1e3,
+    "M": 1e6, "MEG": 1e6, "Meg": 1e6,
+    "G": 1e9,
+}
+
+# Characters left behind by encoding round-trips (e.g. "¬±" for "±").
+_MOJIBAKE = str.maketrans("", "", "¬Â")
+
+_PREFIX_PATTERN = r"MEG|Meg|[pPnNuUµμmkKMG]"
+_UNIT_PATTERN = r"(?i:OHMS?|FARADS?|HENRY|HZ|VDC|VOLTS?|AMPS?|WATTS?|PPM|[FHVAW])|Ω|%"
+
+# A fraction with an optional SI prefix and unit, e.g. "1/4W", "1/8 W".
+_FRACTION_RE = re.compile(
+    r"(?<![\w./])(\d+)/(\d+)\s*(%s)?\s*(%s)?(?![\w])" % (_PREFIX_PATTERN, _UNIT_PATTERN)
+)
+# A number with an optional SI prefix and unit, e.g. "10k", "10 kΩ", "0.1uF", "1%".
+# A denominator ("1/4") is never read as a quantity of its own.
+_QUANTITY_RE = re.compile(
+    r"(?<![\w.])(?<!\d/)(\d+(?:\.\d+)?)\s*(%s)?\s*(%s)?(?![\w])" % (_PREFIX_PATTERN, _UNIT_PATTERN)
+)
+# RKM code notation, e.g. "4k7" (4.7k), "4R7" (4.7 ohm), "2n2" (2.2n).
+_RKM_RE = re.compile(r"(?<![\w.])(\d+)([RkKMunpµ])(\d+)(?![\w])")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+class DescriptionAttributes(NamedTuple):
+    """The normalized, comparable content of a description."""
+    category: Optional[str]
+    values: FrozenSet[Tuple[str, float]]
+    words: FrozenSet[str]
+
+def _canonical_value(number: float) -> float:
+    """Rounds away floating point noise introduced by prefix multiplication."""
+    return float(f"{number:.6g}")
+
+@lru_cache(maxsize=DESCRIPTION_CACHE_SIZE)
+def normalize_description(description: str) -> DescriptionAttributes:
+    """
+    Normalizes a description into its category, values and remaining words.
+
+    Args:
+        description: The raw description text.
+
+    Returns:
+        A DescriptionAttributes tuple. Values are (unit, value) pairs in base
+        units; prefixed values without a unit take the unit implied by the
+        component category (e.g. "10k" on a resistor becomes 10000 OHM).
+    """
+    text = description.translate(_MOJIBAKE)
+    raw_values = []
+
+    def take_rkm(match: re.Match) -> str:
+        whole, marker, fraction = match.groups()
+        number = float(f"{whole}.{fraction}")
+        if marker == "R":
+            raw_values.append(("OHM", number))
+        else:
+            raw_values.append((None, number * SI_PREFIXES[marker]))
+        return " "
+
+    def take_fraction(match: re.Match) -> str:
+        numerator, denominator, prefix, unit = match.groups()
+        if (prefix is None and unit is None) or int(denominator) == 0:
+            # A bare ratio is kept as words.
+            return match.group(0)
+        value = int(numerator) / int(denominator) * SI_PREFIXES.get(prefix, 1.0)
+        raw_values.append((UNIT_ALIASES[unit.upper()] if unit else None, value))
+        return " "
+
+    def take_quantity(match: re.Match) -> str:
+        number, prefix, unit = match.groups()
+        if prefix is None and unit is None:
+            # A bare number (package code, pin count...) is kept as a word.
+            return match.group(0)
+        value = float(number) * SI_PREFIXES.get(prefix, 1.0)
+        raw_values.append((UNIT_ALIASES[unit.upper()] if unit else None, value))
+        return " "
+
+    text = _RKM_RE.sub(take_rkm, text)
+    text = _FRACTION_RE.sub(take_fraction, text)
+    text = _QUANTITY_RE.sub(take_quantity, text)
+
+    words = set()
+    category = None
+    for word in _WORD_RE.findall(text.upper()):
+        word = ABBREVIATIONS.get(word, word)
+        if word in UNIT_ALIASES:
+            continue
+        if category is None and word in CATEGORY_UNITS:
+            category = word
+        words.add(word)
+
+    default_unit = CATEGORY_UNITS.get(category, "")
+    values = frozenset(
+        (unit or default_unit, _canonical_value(value)) for unit, value in raw_values
+    )
+    return DescriptionAttributes(category, values, frozenset(words))
+
+def _with_category_unit(values: FrozenSet[Tuple[str, float]], category: Optional[str]) -> FrozenSet[Tuple[str, float]]:
+    """Gives unitless values the default unit of a component category."""
+    unit = CATEGORY_UNITS.get(category, "")
+    return frozenset((value_unit or unit, value) for value_unit, value in values)
+
+def classify_description_difference(master: str, target: str) -> Optional[str]:
+    """
+    Classifies the difference between two descriptions.
+
+    Returns:
+        None if the descriptions are identical, COSMETIC if they describe the
+        same part (only spelling, abbreviations, units or extra detail differ),
+        or CHANGED if a value, the category or the wording conflicts. The value
+        that defines the part (the resistance of a resistor, ...) is not extra
+        detail: if only one side states it, the difference is CHANGED.
+    """
+    if master == target:
+        return None
+
+    a = normalize_description(master)
+    b = normalize_description(target)
+
+    if a.category and b.category and a.category != b.category:
+        return CHANGED
+
+    # Unitless values on a side without a category take the other side's
+    # category unit, so "10k" can be compared with "Resistor 22k".
+    a_values = _with_category_unit(a.values, b.category) if not a.category else a.values
+    b_values = _with_category_unit(b.values, a.category) if not b.category else b.values
+
+    # Values of a unit present on both sides must agree.
+    a_units = {unit for unit, _ in a_values}
+    b_units = {unit for unit, _ in b_values}
+    for unit in a_units & b_units:
+        if {v for u, v in a_values if u == unit} != {v for u, v in b_values if u == unit}:
+            return CHANGED
+
+    # Unitless values that have nothing to be compared with cannot be shown to agree.
+    if a_values and b_values and ("" in a_units) != ("" in b_units):
+        return CHANGED
+
+    # A dropped or added defining value ("Resistor 10k 1%" -> "Resistor 1%").
+    category_unit = CATEGORY_UNITS.get(a.category or b.category)
+    if category_unit and (category_unit in a_units) != (category_unit in b_units):
+        return CHANGED
+
+    # Extra detail on one side is cosmetic; conflicting wording is not.
+    if not (a.words <= b.words or b.words <= a.words):
+        return CHANGED
+
+    return COSMETIC
@@ -4,7 +4,8 @@ Formatting for BOM Comparison Tool Outputs.
 This module provides functions to format the results of a BOM comparison
 into human-readable strings, including color-coded tables for console output.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from .result import ComparisonResult, Status
 
 # ANSI color codes for highlighting differences in the console.
 COLORS = {
@@ -14,16 +15,53 @@ COLORS = {
     "RESET": "\033[0m",
 }
 
-def format_summary(result: Dict[str, Any]) -> str:
-    """Creates a string summarizing the counts of differences."""
+# Table status labels of the result flags. LIKELY_RENAMED is labelled with the
+# target MPN separately.
+STATUS_LABELS = {
+    Status.MATCHED: 'OK',
+    Status.MISSING: 'MISSING',
+    Status.EXTRA: 'EXTRA',
+    Status.DIFF_QUANTITY: 'DIFF QUANTITY',
+    Status.DIFF_DESCRIPTION: 'DIFF DESCRIPTION',
+    Status.DIFF_REFDES: 'DIFF REFDES',
+    Status.COSMETIC_DESCRIPTION: 'COSMETIC DESCRIPTION',
+}
+
+def format_impact(impact: Dict[str, Any]) -> List[str]:
+    """Creates the summary lines of a cost and availability impact (see core.impact)."""
+    lines = [
+        "Cost Impact:",
+        f"  - Removed Items: {impact['removed_cost']:+,.2f}",
+        f"  - Added Items: {impact['added_cost']:+,.2f}",
+        f"  - Quantity Changes: {impact['quantity_change_cost']:+,.2f}",
+    ]
+    if impact['renamed_cost']:
+        lines.append(f"  - Renamed Parts: {impact['renamed_cost']:+,.2f}")
+    lines.append(f"  - Total Cost Delta: {impact['total_cost_delta']:+,.2f}")
+    if impact['unpriced']:
+        lines.append(f"  - Not Priced (missing from catalog): {len(impact['unpriced'])}")
+    if impact['out_of_stock_additions']:
+        lines.append(f"  - Out-of-Stock Additions: {', '.join(impact['out_of_stock_additions'])}")
+    return lines
+
+def format_summary(result: ComparisonResult, impact: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Creates a string summarizing the counts of differences.
+
+    If a cost impact (from core.impact.compute_impact) is given, its totals
+    are appended to the summary.
+    """
+    counts = result.counts()
     summary_lines = ["Summary of Differences:"]
     summary_data = {
-        "Missing Items": len(result["missing_items"]),
-        "Extra Items": len(result["extra_items"]),
-        "Mismatched Quantity": len(result["mismatched_quantity"]),
-        "Mismatched Description": len(result["mismatched_description"]),
-        "Mismatched RefDes": len(result["mismatched_refdes"]),
-        "Perfectly Matched": len(result["matched"]),
+        "Missing Items": counts["missing_items"],
+        "Extra Items": counts["extra_items"],
+        "Mismatched Quantity": counts["mismatched_quantity"],
+        "Mismatched Description": counts["mismatched_description"],
+        "Mismatched RefDes": counts["mismatched_refdes"],
+        "Likely Renamed": counts["likely_renamed"],
+        "Cosmetic Description Differences": counts["cosmetic_description"],
+        "Perfectly Matched": counts["matched"],
     }
     
     has_differences = False
@@ -34,91 +72,64 @@ def format_summary(result: Dict[str, Any]) -> str:
             
     if not has_differences:
         return "No differences found. All items matched perfectly."
+
+    if impact is not None:
+        summary_lines.extend(format_impact(impact))
         
     return "\n".join(summary_lines)
 
-def format_comparison_as_table(result: Dict[str, Any]) -> str:
+def status_color(statuses: List[str]) -> str:
+    """Returns the highlight color name (a key of COLORS) for a row's statuses."""
+    if 'OK' in statuses:
+        return 'GREEN'
+    if any(s.startswith('DIFF') for s in statuses):
+        return 'RED' # Any field difference, including on a renamed part
+    return 'YELLOW' # MISSING, EXTRA, LIKELY RENAMED or a cosmetic-only difference
+
+def build_comparison_rows(result: ComparisonResult) -> List[Dict[str, Any]]:
+    """
+    Consolidates a comparison result into one row per MPN, sorted by MPN.
+
+    Each row is a dictionary with the keys 'MPN', 'master_qty', 'target_qty'
+    (the quantity or '-' when absent) and 'statuses' (a sorted list).
+    """
+    rows = []
+    # The result yields its records already sorted by MPN.
+    for record in result:
+        statuses = [label for flag, label in STATUS_LABELS.items() if record.status & flag]
+        master_item = result.master_item(record)
+        target_item = result.target_item(record)
+        if record.status & Status.LIKELY_RENAMED:
+            statuses.append(f"LIKELY RENAMED -> {target_item['MPN']}")
+        rows.append({
+            'MPN': record.mpn,
+            'master_qty': master_item['Quantity'] if master_item else '-',
+            'target_qty': target_item['Quantity'] if target_item else '-',
+            'statuses': sorted(statuses),
+        })
+    return rows
+
+def format_comparison_as_table(result: ComparisonResult) -> str:
     """
     Formats the comparison result into a side-by-side table string.
 
     The table includes columns for MPN, Master Quantity, Target Quantity, and
     a Status, with rows highlighted using ANSI colors.
     """
-    
-    # A dictionary to hold the consolidated data for each MPN.
-    # Key: MPN, Value: {master_item, target_item, status_list}
-    unified_data: Dict[str, Dict[str, Any]] = {}
-
-    def get_item(mpn):
-        """Helper to initialize an entry in the unified_data dictionary."""
-        if mpn not in unified_data:
-            unified_data[mpn] = {'master_item': None, 'target_item': None, 'statuses': []}
-        return unified_data[mpn]
-
-    # Process all categories from the comparison result.
-    for item in result['matched']:
-        entry = get_item(item['MPN'])
-        entry['master_item'] = item
-        entry['target_item'] = item
-        entry['statuses'].append('OK')
-
-    for item in result['missing_items']:
-        entry = get_item(item['MPN'])
-        entry['master_item'] = item
-        entry['statuses'].append('MISSING')
-
-    for item in result['extra_items']:
-        entry = get_item(item['MPN'])
-        entry['target_item'] = item
-        entry['statuses'].append('EXTRA')
-
-    # Process mismatch lists. Now they contain the full items.
-    for item in result['mismatched_quantity']:
-        entry = get_item(item['MPN'])
-        entry['master_item'] = item['master_item']
-        entry['target_item'] = item['target_item']
-        entry['statuses'].append('DIFF QUANTITY')
-
-    for item in result['mismatched_description']:
-        entry = get_item(item['MPN'])
-        entry['master_item'] = item['master_item']
-        entry['target_item'] = item['target_item']
-        entry['statuses'].append('DIFF DESCRIPTION')
-
-    for item in result['mismatched_refdes']:
-        entry = get_item(item['MPN'])
-        entry['master_item'] = item['master_item']
-        entry['target_item'] = item['target_item']
-        entry['statuses'].append('DIFF REFDES')
+    rows = build_comparison_rows(result)
 
     # --- Build the table string ---
     header = f"{'MPN':<25} | {'Master Qty':<12} | {'Target Qty':<12} | {'Status'}"
     table_lines = [header, "-" * (len(header) + 5)]
 
-    if not unified_data:
+    if not rows:
         return "No data to display."
 
-    # Sort by MPN for a consistent order.
-    for mpn in sorted(unified_data.keys()):
-        entry = unified_data[mpn]
-        # Use set to remove duplicate statuses if an item has multiple mismatches
-        statuses = sorted(list(set(entry['statuses'])))
-        
-        master_qty = entry['master_item']['Quantity'] if entry['master_item'] else '-'
-        target_qty = entry['target_item']['Quantity'] if entry['target_item'] else '-'
-        
-        status_str = ', '.join(statuses)
-        
-        # Determine color based on status
-        color = COLORS['RESET']
-        if 'OK' in statuses:
-            color = COLORS['GREEN']
-        elif 'MISSING' in statuses or 'EXTRA' in statuses:
-            color = COLORS['YELLOW']
-        else: # Any other difference (DIFF QUANTITY, etc.)
-            color = COLORS['RED']
-
-        row_str = f"{mpn:<25} | {str(master_qty):<12} | {str(target_qty):<12} | {status_str}"
+    for row in rows:
+        status_str = ', '.join(row['statuses'])
+        color = COLORS[status_color(row['statuses'])]
+
+        row_str = f"{row['MPN']:<25} | {str(row['master_qty']):<12} | {str(row['target_qty']):<12} | {status_str}"
         table_lines.append(f"{color}{row_str}{COLORS['RESET']}")
 
     return "\n".join(table_lines)
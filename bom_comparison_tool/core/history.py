@@ -0,0 +1,346 @@
+"""
+BOM Revision History Store.
+
+This module keeps parsed BOMs as versioned revisions in a local SQLite database
+(no external services), indexed by revision and by MPN. Revision-to-revision diffs
+and cross-revision queries (item history, first/last appearance, churn) are
+answered with set-based SQL instead of re-parsing the original files.
+
+Revisions are ordered by ingestion. A revision can be referred to either by its
+numeric id or by its label; a label that was ingested more than once refers to
+its most recent revision. Each revision records a hash of its items, so a file
+that is ingested again unchanged can be skipped (see ingest(skip_unchanged=...)).
+"""
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .models import BOMItem
+
+# Number of rows sent to SQLite per executemany() call during ingestion.
+INSERT_BATCH_SIZE = 5000
+
+RevisionRef = Union[int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    label       TEXT NOT NULL,
+    source      TEXT,
+    ingested_at TEXT NOT NULL,
+    content_hash TEXT          -- SHA-256 of the items, in ingestion order
+);
+CREATE INDEX IF NOT EXISTS idx_revisions_label ON revisions (label, id);
+CREATE INDEX IF NOT EXISTS idx_revisions_source ON revisions (source, id);
+
+CREATE TABLE IF NOT EXISTS items (
+    revision_id INTEGER NOT NULL REFERENCES revisions (id) ON DELETE CASCADE,
+    mpn         TEXT NOT NULL,
+    quantity    INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    refdes      TEXT NOT NULL,  -- JSON list, in source order
+    refdes_key  TEXT NOT NULL,  -- sorted, de-duplicated RefDes for set comparison
+    PRIMARY KEY (revision_id, mpn)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_items_mpn ON items (mpn, revision_id);
+"""
+
+def _refdes_key(refdes: List[str]) -> str:
+    """Builds a canonical string so that equal RefDes sets compare equal in SQL."""
+    return "\x1f".join(sorted(set(refdes)))
+
+def _item_from_row(mpn: str, quantity: int, description: str, refdes: str) -> BOMItem:
+    return BOMItem(MPN=mpn, Quantity=quantity, RefDes=json.loads(refdes), Description=description)
+
+class RevisionStore:
+    """
+    A SQLite-backed store of BOM revisions.
+
+    Usage:
+        with RevisionStore("bom_history.sqlite") as store:
+            rev_a = store.ingest("rev A", master_items, source="master.xlsx")
+            rev_b = store.ingest("rev B", target_items, source="target.csv")
+            diff = store.diff(rev_a, rev_b)
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(revisions)")}
+        if columns and "content_hash" not in columns:
+            # Stores created before content hashes were recorded.
+            self._conn.execute("ALTER TABLE revisions ADD COLUMN content_hash TEXT")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Ingestion ---
+
+    def _insert_revision(self, label: str, items: Iterable[BOMItem], source: Optional[str]) -> Tuple[int, str]:
+        """Inserts a revision and its items; returns its id and content hash."""
+        cursor = self._conn.execute(
+            "INSERT INTO revisions (label, source, ingested_at) VALUES (?, ?, ?)",
+            (label, source, datetime.now(timezone.utc).isoformat())
+        )
+        revision_id = cursor.lastrowid
+
+        content_hash = hashlib.sha256()
+        batch = []
+        for item in items:
+            refdes = json.dumps(item['RefDes'])
+            content_hash.update(json.dumps([item['MPN'], item['Quantity'], item['Description']]).encode("utf-8"))
+            content_hash.update(refdes.encode("utf-8"))
+            batch.append((
+                revision_id, item['MPN'], item['Quantity'], item['Description'], refdes, _refdes_key(item['RefDes'])
+            ))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                self._insert_items(batch)
+                batch = []
+        if batch:
+            self._insert_items(batch)
+
+        digest = content_hash.hexdigest()
+        self._conn.execute("UPDATE revisions SET content_hash = ? WHERE id = ?", (digest, revision_id))
+        return revision_id, digest
+
+    def _insert_items(self, batch: List[Tuple]) -> None:
+        # Like the comparator's MPN map, the last line of a duplicated MPN wins.
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO items (revision_id, mpn, quantity, description, refdes, refdes_key) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            batch
+        )
+
+    def ingest(
+        self, label: str, items: Iterable[BOMItem], source: Optional[str] = None, skip_unchanged: bool = False
+    ) -> int:
+        """
+        Stores a parsed BOM as a new revision in a single transaction.
+
+        Args:
+            label: A human-readable name for the revision (e.g. "Rev C").
+            items: The parsed BOM items.
+            source: Optional path of the file the items were parsed from.
+            skip_unchanged: If True and the most recent revision from the same
+                source holds identical items (same content hash), nothing is
+                stored and that revision's id is returned. Repeated runs over
+                an unchanged file then do not add copies to the history.
+
+        Returns:
+            The id of the new (or unchanged) revision.
+        """
+        with self._conn:
+            revision_id, content_hash = self._insert_revision(label, items, source)
+            if skip_unchanged and source is not None:
+                previous = self._conn.execute(
+                    "SELECT id, content_hash FROM revisions WHERE source = ? AND id < ? ORDER BY id DESC LIMIT 1",
+                    (source, revision_id)
+                ).fetchone()
+                if previous is not None and previous[1] == content_hash:
+                    # The copy and (by cascade) its items are removed before the transaction commits.
+                    self._conn.execute("DELETE FROM revisions WHERE id = ?", (revision_id,))
+                    return previous[0]
+            return revision_id
+
+    def ingest_many(self, revisions: Iterable[Tuple[str, Iterable[BOMItem], Optional[str]]]) -> List[int]:
+        """Stores several (label, items, source) revisions in one transaction."""
+        with self._conn:
+            return [self._insert_revision(label, items, source)[0] for label, items, source in revisions]
+
+    # --- Revisions ---
+
+    def revision_id(self, revision: RevisionRef) -> int:
+        """Resolves a revision id or label to a revision id."""
+        if isinstance(revision, int):
+            row = self._conn.execute("SELECT id FROM revisions WHERE id = ?", (revision,)).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT id FROM revisions WHERE label = ? ORDER BY id DESC LIMIT 1", (revision,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown revision: {revision!r}")
+        return row[0]
+
+    def revisions(self) -> List[Dict[str, Any]]:
+        """Lists all revisions in ingestion order with their item counts."""
+        rows = self._conn.execute(
+            "SELECT r.id, r.label, r.source, r.ingested_at, "
+            "(SELECT COUNT(*) FROM items i WHERE i.revision_id = r.id) "
+            "FROM revisions r ORDER BY r.id"
+        ).fetchall()
+        return [
+            {"id": rid, "label": label, "source": source, "ingested_at": ingested_at, "item_count": count}
+            for rid, label, source, ingested_at, count in rows
+        ]
+
+    def items(self, revision: RevisionRef) -> List[BOMItem]:
+        """Returns the items of a revision, sorted by MPN."""
+        rows = self._conn.execute(
+            "SELECT mpn, quantity, description, refdes FROM items WHERE revision_id = ? ORDER BY mpn",
+            (self.revision_id(revision),)
+        )
+        return [_item_from_row(*row) for row in rows]
+
+    # --- Queries ---
+
+    def diff(self, master: RevisionRef, target: RevisionRef) -> Dict[str, Any]:
+        """
+        Compares two stored revisions.
+
+        Returns:
+            A dictionary with the same categories as compare_boms()
+            (missing_items, extra_items, mismatched_quantity,
+            mismatched_description, mismatched_refdes, matched), sorted by MPN.
+        """
+        master_id = self.revision_id(master)
+        target_id = self.revision_id(target)
+        result = {
+            "missing_items": [],
+            "extra_items": [],
+            "mismatched_quantity": [],
+            "mismatched_description": [],
+            "mismatched_refdes": [],
+            "matched": []
+        }
+
+        only_in = (
+            "SELECT a.mpn, a.quantity, a.description, a.refdes FROM items a "
+            "WHERE a.revision_id = ? AND NOT EXISTS "
+            "(SELECT 1 FROM items b WHERE b.revision_id = ? AND b.mpn = a.mpn) ORDER BY a.mpn"
+        )
+        result["missing_items"] = [
+            _item_from_row(*row) for row in self._conn.execute(only_in, (master_id, target_id))
+        ]
+        result["extra_items"] = [
+            _item_from_row(*row) for row in self._conn.execute(only_in, (target_id, master_id))
+        ]
+
+        rows = self._conn.execute(
+            "SELECT a.mpn, a.quantity, a.description, a.refdes, b.quantity, b.description, b.refdes, "
+            "a.quantity != b.quantity, a.description != b.description, a.refdes_key != b.refdes_key "
+            "FROM items a JOIN items b ON b.revision_id = ? AND b.mpn = a.mpn "
+            "WHERE a.revision_id = ? ORDER BY a.mpn",
+            (target_id, master_id)
+        )
+        for (mpn, m_qty, m_desc, m_refdes, t_qty, t_desc, t_refdes,
+             qty_differs, desc_differs, refdes_differs) in rows:
+            master_item = _item_from_row(mpn, m_qty, m_desc, m_refdes)
+            if not (qty_differs or desc_differs or refdes_differs):
+                result["matched"].append(master_item)
+                continue
+
+            target_item = _item_from_row(mpn, t_qty, t_desc, t_refdes)
+            pair = {'MPN': mpn, 'master_item': master_item, 'target_item': target_item}
+            if qty_differs:
+                result["mismatched_quantity"].append(pair)
+            if desc_differs:
+                result["mismatched_description"].append(pair)
+            if refdes_differs:
+                master_refdes = set(master_item['RefDes'])
+                target_refdes = set(target_item['RefDes'])
+                result["mismatched_refdes"].append(dict(
+                    pair,
+                    added_refdes=sorted(target_refdes - master_refdes),
+                    removed_refdes=sorted(master_refdes - target_refdes)
+                ))
+        return result
+
+    def item_history(self, mpn: str, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the state of one MPN in every revision, oldest first.
+
+        Args:
+            mpn: The Manufacturer Part Number to look up.
+            last: If given, only the most recent `last` revisions are returned.
+
+        Returns:
+            One dictionary per revision with the keys revision_id, label,
+            present, Quantity, Description, RefDes and quantity_changed (True
+            when the quantity differs from the previous revision).
+        """
+        rows = self._conn.execute(
+            "WITH recent AS ("
+            "  SELECT id, label FROM revisions ORDER BY id DESC LIMIT ?"
+            ") "
+            "SELECT r.id, r.label, i.mpn IS NOT NULL, i.quantity, i.description, i.refdes, "
+            "  LAG(i.quantity) OVER (ORDER BY r.id), "
+            "  ROW_NUMBER() OVER (ORDER BY r.id) "
+            "FROM recent r LEFT JOIN items i ON i.revision_id = r.id AND i.mpn = ? "
+            "ORDER BY r.id",
+            (-1 if last is None else last, mpn)
+        )
+        history = []
+        for revision_id, label, present, quantity, description, refdes, previous_quantity, row_number in rows:
+            history.append({
+                "revision_id": revision_id,
+                "label": label,
+                "present": bool(present),
+                "Quantity": quantity,
+                "Description": description,
+                "RefDes": json.loads(refdes) if refdes is not None else None,
+                "quantity_changed": row_number > 1 and quantity != previous_quantity,
+            })
+        return history
+
+    def appearance(self, mpn: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the first and last revisions containing an MPN.
+
+        Returns:
+            A dictionary with first_revision, first_label, last_revision,
+            last_label and revision_count, or None if the MPN was never stored.
+        """
+        row = self._conn.execute(
+            "SELECT MIN(i.revision_id), MAX(i.revision_id), COUNT(*) FROM items i WHERE i.mpn = ?",
+            (mpn,)
+        ).fetchone()
+        first_id, last_id, count = row
+        if not count:
+            return None
+        labels = dict(self._conn.execute(
+            "SELECT id, label FROM revisions WHERE id IN (?, ?)", (first_id, last_id)
+        ).fetchall())
+        return {
+            "first_revision": first_id,
+            "first_label": labels[first_id],
+            "last_revision": last_id,
+            "last_label": labels[last_id],
+            "revision_count": count,
+        }
+
+    def churn(self) -> List[Dict[str, Any]]:
+        """
+        Counts added, removed and changed MPNs per revision.
+
+        Each revision is compared with the revision ingested before it; the
+        first revision reports all of its items as added.
+        """
+        rows = self._conn.execute(
+            "WITH ordered AS ("
+            "  SELECT id, label, LAG(id) OVER (ORDER BY id) AS prev_id FROM revisions"
+            ") "
+            "SELECT o.id, o.label, "
+            "  (SELECT COUNT(*) FROM items c WHERE c.revision_id = o.id AND NOT EXISTS "
+            "    (SELECT 1 FROM items p WHERE p.revision_id = o.prev_id AND p.mpn = c.mpn)), "
+            "  (SELECT COUNT(*) FROM items p WHERE p.revision_id = o.prev_id AND NOT EXISTS "
+            "    (SELECT 1 FROM items c WHERE c.revision_id = o.id AND c.mpn = p.mpn)), "
+            "  (SELECT COUNT(*) FROM items c JOIN items p ON p.revision_id = o.prev_id AND p.mpn = c.mpn "
+            "    WHERE c.revision_id = o.id AND (c.quantity != p.quantity "
+            "      OR c.description != p.description OR c.refdes_key != p.refdes_key)) "
+            "FROM ordered o ORDER BY o.id"
+        )
+        return [
+            {"revision_id": rid, "label": label, "added": added, "removed": removed, "changed": changed}
+            for rid, label, added, removed, changed in rows
+        ]
@@ -0,0 +1,115 @@
+"""
+Cost and Availability Impact of a BOM Comparison.
+
+This module joins a ComparisonResult with a local parts catalog to estimate
+what the differences cost. Only the MPNs that changed are looked up, so the
+impact stage stays cheap however large the catalog is.
+
+Extended cost deltas are computed as quantity delta x unit cost:
+- missing items remove their full master quantity,
+- extra items add their full target quantity,
+- quantity mismatches add or remove the difference,
+- likely renamed parts swap the master extended cost for the target one.
+
+An addition (extra item, quantity increase or renamed target) is flagged as out
+of stock when the catalog's stock does not cover the added quantity. Items with
+no catalog price are listed as unpriced and left out of the totals.
+"""
+from typing import Any, Dict, List, Optional
+
+from .catalog import CatalogEntry, PartsCatalog
+from .result import ComparisonResult, MPNRecord, Status
+
+# Change kinds of an impact line.
+CHANGE_REMOVED = "removed"
+CHANGE_ADDED = "added"
+CHANGE_QUANTITY = "quantity"
+CHANGE_RENAMED = "renamed"
+
+def _extended_cost(entry: Optional[CatalogEntry], quantity: int) -> Optional[float]:
+    if entry is None or entry.unit_cost is None:
+        return None
+    return quantity * entry.unit_cost
+
+def _impact_line(
+    result: ComparisonResult, record: MPNRecord, entries: Dict[str, CatalogEntry]
+) -> Optional[Dict[str, Any]]:
+    """Builds the impact line of a record, or None if it has no cost impact."""
+    master_item = result.master_item(record)
+    target_item = result.target_item(record)
+    master_qty = master_item['Quantity'] if master_item else 0
+    target_qty = target_item['Quantity'] if target_item else 0
+
+    if record.status & Status.LIKELY_RENAMED:
+        change = CHANGE_RENAMED
+        master_cost = _extended_cost(entries.get(record.mpn), master_qty)
+        target_cost = _extended_cost(entries.get(target_item['MPN']), target_qty)
+        cost_delta = None if master_cost is None or target_cost is None else target_cost - master_cost
+        added_mpn, added_qty = target_item['MPN'], target_qty
+    else:
+        if record.status & Status.MISSING:
+            change = CHANGE_REMOVED
+        elif record.status & Status.EXTRA:
+            change = CHANGE_ADDED
+        elif record.status & Status.DIFF_QUANTITY:
+            change = CHANGE_QUANTITY
+        else:
+            return None
+        cost_delta = _extended_cost(entries.get(record.mpn), target_qty - master_qty)
+        added_mpn, added_qty = record.mpn, max(target_qty - master_qty, 0)
+
+    added_entry = entries.get(added_mpn)
+    stock = added_entry.stock if added_entry else None
+    return {
+        'MPN': record.mpn,
+        'added_MPN': added_mpn,
+        'change': change,
+        'master_qty': master_qty,
+        'target_qty': target_qty,
+        'unit_cost': entries[record.mpn].unit_cost if record.mpn in entries else None,
+        'cost_delta': cost_delta,
+        'stock': stock,  # Stock of the added MPN
+        'out_of_stock': added_qty > 0 and stock is not None and stock < added_qty,
+    }
+
+def compute_impact(result: ComparisonResult, catalog: PartsCatalog) -> Dict[str, Any]:
+    """
+    Estimates the cost and availability impact of a comparison.
+
+    Args:
+        result: The result of compare_boms().
+        catalog: An open parts catalog (see core.catalog.open_catalog).
+
+    Returns:
+        A dictionary with the per-MPN impact 'lines' (sorted by MPN), the
+        'removed_cost', 'added_cost', 'quantity_change_cost', 'renamed_cost'
+        and 'total_cost_delta' totals, and the MPNs of 'out_of_stock_additions'
+        and 'unpriced' lines.
+    """
+    changed_flags = Status.MISSING | Status.EXTRA | Status.DIFF_QUANTITY | Status.LIKELY_RENAMED
+    records = [record for record in result if record.status & changed_flags]
+
+    mpns = [record.mpn for record in records]
+    mpns += [result.target_item(record)['MPN'] for record in records if record.status & Status.LIKELY_RENAMED]
+    entries = catalog.lookup_many(mpns)
+
+    lines: List[Dict[str, Any]] = []
+    totals = {CHANGE_REMOVED: 0.0, CHANGE_ADDED: 0.0, CHANGE_QUANTITY: 0.0, CHANGE_RENAMED: 0.0}
+    for record in records:
+        line = _impact_line(result, record, entries)
+        if line is None:
+            continue
+        lines.append(line)
+        if line['cost_delta'] is not None:
+            totals[line['change']] += line['cost_delta']
+
+    return {
+        'lines': lines,
+        'removed_cost': totals[CHANGE_REMOVED],
+        'added_cost': totals[CHANGE_ADDED],
+        'quantity_change_cost': totals[CHANGE_QUANTITY],
+        'renamed_cost': totals[CHANGE_RENAMED],
+        'total_cost_delta': sum(totals.values()),
+        'out_of_stock_additions': [line['added_MPN'] for line in lines if line['out_of_stock']],
+        'unpriced': [line['MPN'] for line in lines if line['cost_delta'] is None],
+    }
@@ -0,0 +1,168 @@
+"""
+Isolated, Resource-Limited BOM Parsing.
+
+This module runs parse_bom_file() in a separate worker process with a wall-clock
+timeout and a memory limit, so that a pathological input (a malformed PDF, a
+decompression-bomb XLSX) cannot hang or exhaust the process driving a batch.
+
+If the first attempt times out, runs out of memory or crashes, the file is parsed
+once more with the streaming parsers. If that fails too, the failure is returned
+as an ErrorDict whose `kind` records what happened, and the caller can simply
+move on to the next file.
+
+Because the worker process can be killed at any time, a caller can also pass a
+cancel event (e.g. the GUI's Stop button) to abandon a parse that is under way.
+"""
+import multiprocessing
+import threading
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; the memory limit is skipped.
+    resource = None
+
+from .models import ErrorDict, ParseResult
+from .parsers import parse_bom_file
+
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_MEMORY_LIMIT_MB = 2048
+
+# ErrorDict kinds reported by the isolation layer.
+KIND_TIMEOUT = "timeout"
+KIND_MEMORY = "memory"
+KIND_CRASH = "crash"
+KIND_CANCELLED = "cancelled"
+
+# How often (seconds) a running parse checks its cancel event.
+CANCEL_POLL_INTERVAL = 0.1
+# Allocations that fail inside C extensions (lxml, zlib, ...) under the rlimit do
+# not always surface as MemoryError; a parser error is attributed to the limit
+# when the worker's peak address space came at least this close to it (the
+# failed allocation itself is not counted in the peak).
+MEMORY_LIMIT_HIT_FRACTION = 0.75
+
+# "spawn" gives the worker a clean interpreter, which is safe even when the
+# caller has other threads running (e.g. the GUI).
+_context = multiprocessing.get_context("spawn")
+
+def _peak_address_space() -> Optional[int]:
+    """Returns the peak virtual memory size of this process in bytes, if known (Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmPeak:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _parse_in_child(conn, file_path: str, streaming: bool, memory_limit_bytes: Optional[int]):
+    """Worker-process entry point: applies the rlimit, parses, and sends the result back."""
+    limited = False
+    if resource is not None and memory_limit_bytes:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+            limited = True
+        except (ValueError, OSError):
+            pass  # The limit could not be applied on this platform; parse anyway.
+    try:
+        result = parse_bom_file(file_path, streaming=streaming)
+    except MemoryError:
+        result = ErrorDict(error="Parser exceeded the memory limit.", file_path=file_path, kind=KIND_MEMORY)
+    if limited and isinstance(result, dict) and 'kind' not in result:
+        peak = _peak_address_space()
+        if peak is not None and peak >= memory_limit_bytes * MEMORY_LIMIT_HIT_FRACTION:
+            result = ErrorDict(
+                error=f"Parser exceeded the memory limit: {result['error']}", file_path=file_path, kind=KIND_MEMORY
+            )
+    try:
+        conn.send(result)
+    except MemoryError:
+        conn.send(ErrorDict(error="Parser exceeded the memory limit.", file_path=file_path, kind=KIND_MEMORY))
+    finally:
+        conn.close()
+
+def _wait_for_result(conn, timeout: Optional[float], cancel_event: Optional[threading.Event]) -> bool:
+    """Waits until the worker has sent its result; False on timeout or cancellation."""
+    if cancel_event is None:
+        return conn.poll(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not cancel_event.is_set():
+        remaining = CANCEL_POLL_INTERVAL if deadline is None else min(CANCEL_POLL_INTERVAL, deadline - time.monotonic())
+        if remaining <= 0:
+            return False
+        if conn.poll(remaining):
+            return True
+    return False
+
+def _run_isolated(
+    file_path: str, streaming: bool, timeout: Optional[float], memory_limit_mb: Optional[int],
+    cancel_event: Optional[threading.Event] = None
+) -> ParseResult:
+    """Runs one parsing attempt in a worker process and collects its result."""
+    parent_conn, child_conn = _context.Pipe(duplex=False)
+    memory_limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+    process = _context.Process(
+        target=_parse_in_child,
+        args=(child_conn, file_path, streaming, memory_limit_bytes),
+        daemon=True
+    )
+    process.start()
+    child_conn.close()
+
+    try:
+        if not _wait_for_result(parent_conn, timeout, cancel_event):
+            process.kill()
+            if cancel_event is not None and cancel_event.is_set():
+                return ErrorDict(error="Parsing was cancelled.", file_path=file_path, kind=KIND_CANCELLED)
+            return ErrorDict(
+                error=f"Parsing timed out after {timeout:g} seconds.", file_path=file_path, kind=KIND_TIMEOUT
+            )
+        try:
+            return parent_conn.recv()
+        except (EOFError, OSError):
+            process.join()
+            return ErrorDict(
+                error=f"Parser process exited unexpectedly (exit code {process.exitcode}).",
+                file_path=file_path,
+                kind=KIND_CRASH
+            )
+    finally:
+        parent_conn.close()
+        process.join()
+
+def parse_bom_file_isolated(
+    file_path: str,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    memory_limit_mb: Optional[int] = DEFAULT_MEMORY_LIMIT_MB,
+    cancel_event: Optional[threading.Event] = None,
+) -> ParseResult:
+    """
+    Parses a BOM file in a resource-limited worker process.
+
+    Args:
+        file_path: The absolute or relative path to the BOM file.
+        timeout: Wall-clock limit in seconds for each parsing attempt. None
+            disables the limit.
+        memory_limit_mb: Address-space limit for the worker process, in MB.
+            None disables the limit. Ignored where rlimits are unavailable.
+        cancel_event: Optional event; once set, the worker process is killed
+            and the parse is not retried.
+
+    Returns:
+        A ParseResult. Ordinary parser errors are returned unchanged; timeouts,
+        memory exhaustion, crashes and cancellation are returned as an ErrorDict
+        with `kind` set to "timeout", "memory", "crash" or "cancelled".
+    """
+    result = _run_isolated(file_path, False, timeout, memory_limit_mb, cancel_event)
+    if 'kind' not in result or result['kind'] == KIND_CANCELLED:
+        return result
+
+    # Retry once with the streaming parsers, which need far less memory.
+    retry = _run_isolated(file_path, True, timeout, memory_limit_mb, cancel_event)
+    if 'kind' not in retry or retry['kind'] == KIND_CANCELLED:
+        return retry
+    retry['error'] = f"{retry['error']} (retried with the streaming parser)"
+    return retry
@@ -16,12 +16,19 @@ class BOMItem(TypedDict):
     RefDes: List[str]
     Description: str
 
-class ErrorDict(TypedDict):
+class _ErrorDictBase(TypedDict):
+    error: str
+    file_path: str
+
+class ErrorDict(_ErrorDictBase, total=False):
     """
     A standardized structure for returning errors from the parsers.
+
+    The optional `kind` is set when the failure was detected outside the parser
+    itself, e.g. by the isolation layer ("timeout", "memory", "crash" or
+    "cancelled").
     """
-    error: str
-    file_path: str
+    kind: str
 
 # A Union type to represent the result of a parsing operation, which can
 # either be a list of valid BOM items or an error dictionary.
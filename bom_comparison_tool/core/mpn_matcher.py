@@ -0,0 +1,181 @@
+"""
+Fuzzy MPN Reconciliation.
+
+This module pairs up MPNs that are reported as missing from one BOM and extra in
+the other but most likely refer to the same part (e.g. "RC0603FR-0710KL" vs
+"rc0603fr0710kl"). Candidates are first compared on a canonical form of the MPN
+and then matched through character n-gram indexes, one per set of digit runs,
+so the cost grows with the number of rare shared n-grams rather than with
+missing x extra.
+"""
+import math
+import re
+from typing import Dict, FrozenSet, List, Set, Tuple, Iterable
+
+from .models import BOMItem
+
+# Prefixes that distributors or internal PLM exports prepend to the real MPN.
+# They are stripped during canonicalization so "TI:LM358DR" matches "LM358DR".
+KNOWN_MPN_PREFIXES = (
+    "TI", "ADI", "MCHP", "STM", "NXP", "ONSEMI", "YAGEO", "MURATA", "TDK",
+    "KEMET", "VISHAY", "BOURNS", "WURTH", "INFINEON",
+)
+
+# Characters commonly used as separators inside MPNs.
+_SEPARATORS_RE = re.compile(r"[\s\-_./,:#]+")
+_PREFIX_RE = re.compile(
+    r"^(?:%s)\s*[:\-_/]\s*" % "|".join(re.escape(p) for p in KNOWN_MPN_PREFIXES),
+    re.IGNORECASE,
+)
+
+_DIGIT_RUN_RE = re.compile(r"\d+")
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+NGRAM_SIZE = 3
+
+def normalize_mpn(mpn: str) -> str:
+    """
+    Reduces an MPN to a canonical form for matching.
+
+    The canonical form is upper-case, has known manufacturer prefixes removed,
+    and has all separator characters (spaces, dashes, dots, etc.) stripped.
+    """
+    mpn = _PREFIX_RE.sub("", mpn.strip())
+    return _SEPARATORS_RE.sub("", mpn).upper()
+
+def _digit_runs(canonical: str) -> Tuple[str, ...]:
+    """Returns the runs of digits in a canonical MPN (value, size and tolerance codes)."""
+    return tuple(_DIGIT_RUN_RE.findall(canonical))
+
+def _ngrams(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """Returns the set of character n-grams of a string, padded at both ends."""
+    padded = f"{'^' * (n - 1)}{text}$"
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class NGramIndex:
+    """
+    An inverted index from character n-grams to the keys that contain them.
+
+    Similarity between two keys is the Dice coefficient of their n-gram sets.
+    A search uses a prefix filter: a key reaching the threshold shares at least
+    `min_shared` n-grams with the query, so it must contain one of the query's
+    len(grams) - min_shared + 1 rarest n-grams. Only those posting lists are
+    walked; frequent n-grams (a common manufacturer prefix) are skipped.
+    """
+    def __init__(self, n: int = NGRAM_SIZE):
+        self.n = n
+        self._postings: Dict[str, List[int]] = {}
+        self._grams: List[FrozenSet[str]] = []
+        self.keys: List[str] = []
+
+    def add(self, key: str) -> int:
+        """Adds a key to the index and returns its position."""
+        position = len(self.keys)
+        grams = frozenset(_ngrams(key, self.n))
+        self.keys.append(key)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(position)
+        return position
+
+    def search(self, query: str, threshold: float) -> List[Tuple[int, float]]:
+        """
+        Finds indexed keys whose similarity to the query meets the threshold.
+
+        Returns:
+            A list of (position, similarity) tuples, best match first.
+        """
+        if threshold > 1.0:
+            return []
+        grams = _ngrams(query, self.n)
+        # Dice >= t with shared <= len(key grams) implies shared >= t * len(grams) / (2 - t).
+        min_shared = max(math.ceil(threshold * len(grams) / (2.0 - threshold) - 1e-9), 1)
+        rarest = sorted(grams, key=lambda gram: (len(self._postings.get(gram, ())), gram))
+        candidates: Set[int] = set()
+        for gram in rarest[:len(grams) - min_shared + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        matches = []
+        for position in candidates:
+            key_grams = self._grams[position]
+            similarity = 2.0 * len(grams & key_grams) / (len(grams) + len(key_grams))
+            if similarity >= threshold:
+                matches.append((position, similarity))
+        matches.sort(key=lambda match: (-match[1], self.keys[match[0]]))
+        return matches
+
+def find_likely_renamed(
+    missing_items: Iterable[BOMItem],
+    extra_items: Iterable[BOMItem],
+    threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+) -> List[Tuple[BOMItem, BOMItem, float]]:
+    """
+    Pairs missing master items with extra target items that are probably renames.
+
+    Items whose canonical MPNs are identical are paired first with a similarity
+    of 1.0. The remaining items are matched through an n-gram index and paired
+    greedily, best similarity first, so each item is used at most once.
+
+    Approximate matches must have the same digit runs: digits in an MPN usually
+    encode the value, size or tolerance ("0710" = 10k, "104" = 100nF), so MPNs
+    that differ inside a digit run are different parts, however similar. Extra
+    items are therefore indexed per set of digit runs, and each missing item is
+    only searched against its own bucket.
+
+    Args:
+        missing_items: Items present in the master but not in the target.
+        extra_items: Items present in the target but not in the master.
+        threshold: The minimum similarity (0-1) for a pair to be reported.
+
+    Returns:
+        A list of (master_item, target_item, similarity) tuples.
+    """
+    missing_items = sorted(missing_items, key=lambda item: item['MPN'])
+    extra_items = sorted(extra_items, key=lambda item: item['MPN'])
+
+    pairs: List[Tuple[BOMItem, BOMItem, float]] = []
+    used_extra: Set[int] = set()
+    unmatched_missing: List[Tuple[BOMItem, str]] = []
+
+    # 1. Exact matches on the canonical form.
+    extra_by_canonical: Dict[str, List[int]] = {}
+    for i, item in enumerate(extra_items):
+        extra_by_canonical.setdefault(normalize_mpn(item['MPN']), []).append(i)
+
+    for item in missing_items:
+        canonical = normalize_mpn(item['MPN'])
+        candidates = [i for i in extra_by_canonical.get(canonical, []) if i not in used_extra]
+        if candidates:
+            used_extra.add(candidates[0])
+            pairs.append((item, extra_items[candidates[0]], 1.0))
+        else:
+            unmatched_missing.append((item, canonical))
+
+    # 2. Approximate matches through one n-gram index per set of digit runs.
+    buckets: Dict[Tuple[str, ...], Tuple[NGramIndex, List[int]]] = {}
+    for i, item in enumerate(extra_items):
+        if i not in used_extra:
+            canonical = normalize_mpn(item['MPN'])
+            index, extra_positions = buckets.setdefault(_digit_runs(canonical), (NGramIndex(), []))
+            index.add(canonical)
+            extra_positions.append(i)
+
+    candidates = []
+    for item, canonical in unmatched_missing:
+        bucket = buckets.get(_digit_runs(canonical))
+        if bucket is None:
+            continue
+        index, extra_positions = bucket
+        for position, similarity in index.search(canonical, threshold):
+            candidates.append((similarity, item['MPN'], extra_positions[position], item))
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    used_missing: Set[str] = set()
+    for similarity, mpn, extra_index, item in candidates:
+        if mpn in used_missing or extra_index in used_extra:
+            continue
+        used_missing.add(mpn)
+        used_extra.add(extra_index)
+        pairs.append((item, extra_items[extra_index], round(similarity, 4)))
+
+    return pairs
@@ -8,11 +8,28 @@ dictionaries.
 Each parser is designed to be resilient to common issues like alternate column
 names and missing headers. If a file cannot be parsed, a structured error is
 returned.
+
+Each format also has a streaming variant (selected with `streaming=True`) that
+reads rows incrementally from a binary stream instead of materializing the whole
+file first. The raw file contents are never buffered as a whole (only the
+parsed items are collected), and it produces the same items as the default
+parsers.
+
+The format is detected from the file content (magic bytes) rather than trusted
+from the extension; only plain-text formats, which have no magic bytes, rely on
+the extension. Gzip-compressed files (e.g. `.csv.gz`) are decompressed on the
+fly, and members of a `.zip` bundle are addressed as `bundle.zip::member.csv`
+and read straight from the archive. Nothing is extracted to disk.
 """
 import os
+import io
 import csv
 import re
-from typing import List, Dict, Optional, Tuple, Any
+import gzip
+import zipfile
+from contextlib import contextmanager, ExitStack
+from itertools import chain, islice
+from typing import List, Dict, Optional, Tuple, Any, Iterable, Iterator, BinaryIO, Callable
 
 import openpyxl
 from docx import Document
@@ -79,8 +96,12 @@ def _find_header_map(rows: List[List[Any]]) -> Optional[Tuple[int, Dict[int, str
 
 def _process_data_rows(rows: List[List[Any]], header_map: Dict[int, str], start_index: int) -> List[BOMItem]:
     """Processes rows into a list of BOMItem dictionaries using the header map."""
+    return _rows_to_items(islice(rows, start_index, None), header_map)
+
+def _rows_to_items(rows: Iterable[List[Any]], header_map: Dict[int, str]) -> List[BOMItem]:
+    """Converts data rows (after the header) into BOMItem dictionaries."""
     bom_items = []
-    for row in rows[start_index:]:
+    for row in rows:
         if not any(row):  # Skip empty rows
             continue
 
@@ -115,6 +136,24 @@ def _process_data_rows(rows: List[List[Any]], header_map: Dict[int, str], start_
         ))
     return bom_items
 
+def _process_row_stream(rows: Iterable[List[Any]]) -> Optional[List[BOMItem]]:
+    """
+    Streaming counterpart of _find_header_map() + _process_data_rows().
+
+    Rows are consumed one at a time: rows before the header are discarded and
+    the remaining rows are converted as they are read.
+
+    Returns:
+        The list of BOMItem dictionaries, or None if no header row was found.
+    """
+    rows = iter(rows)
+    for row in rows:
+        header_info = _find_header_map([row])
+        if header_info:
+            _, header_map = header_info
+            return _rows_to_items(rows, header_map)
+    return None
+
 # --- Individual File Parsers ---
 
 def _parse_xlsx(file_path: str) -> ParseResult:
@@ -131,6 +170,8 @@ def _parse_xlsx(file_path: str) -> ParseResult:
         header_idx, header_map = header_info
         return _process_data_rows(rows, header_map, header_idx + 1)
 
+    except MemoryError:
+        raise
     except Exception as e:
         return ErrorDict(error=f"Failed to parse XLSX file: {e}", file_path=file_path)
 
@@ -151,6 +192,8 @@ def _parse_csv(file_path: str) -> ParseResult:
         header_idx, header_map = header_info
         return _process_data_rows(rows, header_map, header_idx + 1)
 
+    except MemoryError:
+        raise
     except Exception as e:
         return ErrorDict(error=f"Failed to parse CSV file: {e}", file_path=file_path)
 
@@ -189,13 +232,15 @@ def _parse_txt(file_path: str) -> ParseResult:
         header_idx, header_map = header_info
         return _process_data_rows(rows, header_map, header_idx + 1)
 
+    except MemoryError:
+        raise
     except Exception as e:
         return ErrorDict(error=f"Failed to parse TXT file: {e}", file_path=file_path)
 
-def _parse_docx(file_path: str) -> ParseResult:
-    """Parses tables from a DOCX file."""
+def _parse_docx(file_path: str, stream: Optional[BinaryIO] = None) -> ParseResult:
+    """Parses tables from a DOCX file (or from an already opened binary stream)."""
     try:
-        document = Document(file_path)
+        document = Document(stream if stream is not None else file_path)
         all_items = []
         if not document.tables:
             return ErrorDict(error="No tables found in the DOCX file.", file_path=file_path)
@@ -212,6 +257,8 @@ def _parse_docx(file_path: str) -> ParseResult:
             
         return all_items
 
+    except MemoryError:
+        raise
     except Exception as e:
         return ErrorDict(error=f"Failed to parse DOCX file: {e}", file_path=file_path)
 
@@ -241,37 +288,316 @@ def _parse_pdf(file_path: str) -> ParseResult:
         header_idx, header_map = header_info
         return _process_data_rows(rows, header_map, header_idx + 1)
 
+    except MemoryError:
+        raise
+    except Exception as e:
+        return ErrorDict(error=f"Failed to parse PDF file: {e}", file_path=file_path)
+
+
+# --- Streaming File Parsers ---
+
+def _text_rows_source(text: io.TextIOBase, sample: str) -> Iterator[str]:
+    """Re-joins a sample already read from a text stream with the rest of the stream."""
+    return chain(io.StringIO(sample + text.readline()), text)
+
+def _parse_xlsx_streaming(stream: BinaryIO, file_path: str) -> ParseResult:
+    """Parses an XLSX/XLSM workbook in openpyxl's read-only (streaming) mode."""
+    try:
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+        try:
+            items = _process_row_stream(list(row) for row in workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+        if items is None:
+            return ErrorDict(error="Could not find a valid header row.", file_path=file_path)
+        return items
+
+    except MemoryError:
+        raise
+    except Exception as e:
+        return ErrorDict(error=f"Failed to parse XLSX file: {e}", file_path=file_path)
+
+def _parse_csv_streaming(stream: BinaryIO, file_path: str) -> ParseResult:
+    """Parses a CSV file row by row."""
+    try:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+        sample = text.read(1024)
+        dialect = csv.Sniffer().sniff(sample)
+        items = _process_row_stream(csv.reader(_text_rows_source(text, sample), dialect))
+        text.detach()
+
+        if items is None:
+            return ErrorDict(error="Could not find a valid header row.", file_path=file_path)
+        return items
+
+    except MemoryError:
+        raise
+    except Exception as e:
+        return ErrorDict(error=f"Failed to parse CSV file: {e}", file_path=file_path)
+
+def _parse_txt_streaming(stream: BinaryIO, file_path: str) -> ParseResult:
+    """Parses a TXT/TSV file row by row, using the same delimiter heuristic as _parse_txt()."""
+    try:
+        text = io.TextIOWrapper(stream, encoding='utf-8')
+        sample = text.read(2048)
+
+        if '\t' in sample:
+            delimiter = '\t'
+        elif ',' in sample:
+            delimiter = ','
+        elif ';' in sample:
+            delimiter = ';'
+        else:
+            delimiter = None
+
+        lines = _text_rows_source(text, sample)
+        if delimiter:
+            rows = csv.reader(lines, delimiter=delimiter)
+        else:
+            rows = (re.split(r'\s{2,}', line.strip()) for line in lines)
+        items = _process_row_stream(rows)
+        text.detach()
+
+        if items is None:
+            return ErrorDict(error="Could not find a valid header row.", file_path=file_path)
+        return items
+
+    except MemoryError:
+        raise
+    except Exception as e:
+        return ErrorDict(error=f"Failed to parse TXT file: {e}", file_path=file_path)
+
+def _parse_docx_streaming(stream: BinaryIO, file_path: str) -> ParseResult:
+    """Parses a DOCX file from a stream. python-docx always loads the whole document."""
+    return _parse_docx(file_path, stream)
+
+def _iter_pdf_rows(reader: PdfReader) -> Iterator[List[str]]:
+    """Yields the text rows of a PDF one page at a time."""
+    for page in reader.pages:
+        for line in page.extract_text().split('\n'):
+            if line.strip():
+                yield re.split(r'\s{2,}', line.strip())
+
+def _parse_pdf_streaming(stream: BinaryIO, file_path: str) -> ParseResult:
+    """Parses a text-based PDF page by page instead of concatenating all text."""
+    try:
+        items = _process_row_stream(_iter_pdf_rows(PdfReader(stream)))
+        if items is None:
+            return ErrorDict(error="Could not find a valid header in the extracted PDF text.", file_path=file_path)
+        return items
+
+    except MemoryError:
+        raise
     except Exception as e:
         return ErrorDict(error=f"Failed to parse PDF file: {e}", file_path=file_path)
 
 
+# --- Format Detection ---
+
+# Separator between an archive path and a member name, e.g. "bundle.zip::rev2.csv".
+ARCHIVE_MEMBER_SEP = "::"
+
+# Format name returned for a zip file that is a bundle of BOM files (as opposed
+# to a zip-based document such as XLSX or DOCX).
+ARCHIVE_FORMAT = "zip"
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06")
+PDF_MAGIC = b"%PDF"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0"  # Legacy .xls/.doc, which are not supported.
+
+# Plain-text formats have no magic bytes and are recognized by extension.
+TEXT_EXTENSIONS = {'.csv': 'csv', '.tsv': 'tsv', '.txt': 'txt'}
+
+# Parsers per format: (parser taking a plain file path, parser taking a binary
+# stream). The path parsers are used for plain files whose extension matches
+# the detected format; everything else goes through the stream parsers.
+PARSER_REGISTRY: Dict[str, Tuple[Callable[[str], ParseResult], Callable[[BinaryIO, str], ParseResult]]] = {
+    'xlsx': (_parse_xlsx, _parse_xlsx_streaming),
+    'csv': (_parse_csv, _parse_csv_streaming),
+    'tsv': (_parse_txt, _parse_txt_streaming),
+    'txt': (_parse_txt, _parse_txt_streaming),
+    'docx': (_parse_docx, _parse_docx_streaming),
+    'pdf': (_parse_pdf, _parse_pdf_streaming),
+}
+
+# Extensions for which the path parser of a format can be used directly.
+FORMAT_EXTENSIONS = {
+    'xlsx': ('.xlsx', '.xlsm'),
+    'csv': ('.csv',),
+    'tsv': ('.tsv',),
+    'txt': ('.txt',),
+    'docx': ('.docx',),
+    'pdf': ('.pdf',),
+}
+
+def _split_member(file_path: str) -> Tuple[str, Optional[str]]:
+    """Splits "archive.zip::member" into (archive, member); plain paths give (path, None)."""
+    if ARCHIVE_MEMBER_SEP in file_path:
+        archive, member = file_path.split(ARCHIVE_MEMBER_SEP, 1)
+        return archive, member
+    return file_path, None
+
+@contextmanager
+def _open_source(file_path: str) -> Iterator[Tuple[BinaryIO, str, bool]]:
+    """
+    Opens a BOM source as a binary stream, decompressing gzip layers on the fly.
+
+    Yields:
+        A tuple of (stream, logical_name, is_plain_file). The logical name has
+        any ".gz" suffix removed; is_plain_file is False for archive members
+        and compressed files.
+    """
+    archive, member = _split_member(file_path)
+    with ExitStack() as stack:
+        if member is None:
+            stream = stack.enter_context(open(archive, 'rb'))
+            name = archive
+        else:
+            bundle = stack.enter_context(zipfile.ZipFile(archive))
+            stream = stack.enter_context(bundle.open(member))
+            name = member
+
+        is_plain_file = member is None
+        while stream.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+            stream = stack.enter_context(gzip.GzipFile(fileobj=stream, mode='rb'))
+            if name.lower().endswith('.gz'):
+                name = name[:-3]
+            is_plain_file = False
+        yield stream, name, is_plain_file
+
+def _zip_container_format(stream: BinaryIO, name: str) -> str:
+    """Tells apart XLSX/XLSM and DOCX documents from zip bundles of BOM files."""
+    extension = os.path.splitext(name.lower())[1]
+    if extension in ('.xlsx', '.xlsm'):
+        return 'xlsx'
+    if extension == '.docx':
+        return 'docx'
+    if extension == '.zip':
+        return ARCHIVE_FORMAT
+
+    # Unknown extension: look at the archive's table of contents.
+    position = stream.tell()
+    try:
+        names = set(zipfile.ZipFile(stream).namelist())
+    finally:
+        stream.seek(position)
+    if 'xl/workbook.xml' in names:
+        return 'xlsx'
+    if 'word/document.xml' in names:
+        return 'docx'
+    return ARCHIVE_FORMAT
+
+def _detect_stream_format(stream: BinaryIO, name: str) -> Optional[str]:
+    """Detects the format of an opened (already decompressed) source."""
+    head = stream.peek(8)[:8]
+    if head.startswith(PDF_MAGIC):
+        return 'pdf'
+    if head.startswith(ZIP_MAGICS):
+        return _zip_container_format(stream, name)
+    if head.startswith(OLE_MAGIC):
+        return None
+    return TEXT_EXTENSIONS.get(os.path.splitext(name.lower())[1])
+
+def detect_format(file_path: str) -> Optional[str]:
+    """
+    Detects the format of a BOM source from its content.
+
+    Args:
+        file_path: A file path, optionally gzip-compressed, or an archive member
+            in the form "archive.zip::member".
+
+    Returns:
+        One of the PARSER_REGISTRY formats, ARCHIVE_FORMAT for a zip bundle of
+        BOM files, or None if the format is not supported.
+    """
+    with _open_source(file_path) as (stream, name, _):
+        return _detect_stream_format(stream, name)
+
+def expand_archive_targets(file_paths: List[str]) -> List[str]:
+    """
+    Replaces zip bundles in a list of BOM sources by one entry per member.
+
+    Members are addressed as "archive.zip::member" and can then be parsed (in
+    parallel, if desired) as independent targets. Directories and hidden or
+    macOS metadata entries are skipped. Other paths are returned unchanged;
+    this includes compressed (".zip.gz") or nested bundles, which are reported
+    as an error for that target when parsed.
+    """
+    expanded = []
+    for file_path in file_paths:
+        try:
+            with _open_source(file_path) as (stream, name, is_plain_file):
+                # Only a plain zip file on disk can be opened again member by member.
+                is_bundle = is_plain_file and _detect_stream_format(stream, name) == ARCHIVE_FORMAT
+        except (OSError, EOFError, KeyError, zipfile.BadZipFile):
+            is_bundle = False  # Reported when the file is parsed.
+        if not is_bundle:
+            expanded.append(file_path)
+            continue
+
+        with zipfile.ZipFile(_split_member(file_path)[0]) as bundle:
+            for info in bundle.infolist():
+                base_name = os.path.basename(info.filename)
+                if info.is_dir() or not base_name or base_name.startswith('.') or info.filename.startswith('__MACOSX/'):
+                    continue
+                expanded.append(f"{file_path}{ARCHIVE_MEMBER_SEP}{info.filename}")
+    return expanded
+
+
 # --- Main Dispatcher Function ---
 
-def parse_bom_file(file_path: str) -> ParseResult:
+def parse_bom_file(file_path: str, streaming: bool = False) -> ParseResult:
     """
-    Parses a BOM file, dispatching to the correct parser based on extension.
+    Parses a BOM file, dispatching to the correct parser based on its content.
 
     Args:
-        file_path: The absolute or relative path to the BOM file.
+        file_path: The absolute or relative path to the BOM file. Gzip-compressed
+            files are supported, and members of a zip bundle can be addressed as
+            "bundle.zip::member.csv".
+        streaming: If True, use the streaming parsers, which read rows
+            incrementally instead of buffering the raw file contents (the
+            parsed items are still collected in a list). Compressed files and
+            archive members are always parsed this way.
 
     Returns:
         A ParseResult, which is either a list of BOMItem dictionaries on success
         or an ErrorDict on failure.
     """
-    if not os.path.exists(file_path):
+    archive, member = _split_member(file_path)
+    if not os.path.exists(archive):
         return ErrorDict(error="File not found.", file_path=file_path)
 
-    _, extension = os.path.splitext(file_path.lower())
-
-    if extension == '.xlsx':
-        return _parse_xlsx(file_path)
-    if extension == '.csv':
-        return _parse_csv(file_path)
-    if extension == '.txt':
-        return _parse_txt(file_path)
-    if extension == '.docx':
-        return _parse_docx(file_path)
-    if extension == '.pdf':
-        return _parse_pdf(file_path)
-
-    return ErrorDict(error=f"Unsupported file extension: '{extension}'", file_path=file_path)
+    try:
+        return _dispatch(file_path, streaming)
+    except MemoryError:
+        return ErrorDict(error="Ran out of memory while parsing the file.", file_path=file_path, kind="memory")
+    except KeyError:
+        return ErrorDict(error=f"Member '{member}' not found in archive.", file_path=file_path)
+    except (OSError, EOFError, zipfile.BadZipFile) as e:
+        return ErrorDict(error=f"Could not read file: {e}", file_path=file_path)
+
+def _dispatch(file_path: str, streaming: bool) -> ParseResult:
+    """Detects the format of a source and runs the matching parser."""
+    with _open_source(file_path) as (stream, name, is_plain_file):
+        file_format = _detect_stream_format(stream, name)
+        _, extension = os.path.splitext(name.lower())
+
+        if file_format is None:
+            return ErrorDict(error=f"Unsupported file extension: '{extension}'", file_path=file_path)
+        if file_format == ARCHIVE_FORMAT:
+            if not is_plain_file:
+                return ErrorDict(
+                    error="Compressed or nested zip bundles are not supported; decompress the bundle first.",
+                    file_path=file_path
+                )
+            return ErrorDict(
+                error="File is an archive of BOM files; expand it into member targets first.",
+                file_path=file_path
+            )
+
+        path_parser, stream_parser = PARSER_REGISTRY[file_format]
+        if is_plain_file and not streaming and extension in FORMAT_EXTENSIONS[file_format]:
+            return path_parser(file_path)
+        return stream_parser(stream, file_path)
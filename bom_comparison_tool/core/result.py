@@ -0,0 +1,238 @@
+"""
+Comparison Result Model.
+
+This module defines the object returned by compare_boms(). Instead of copying
+items into several category lists, it keeps a single record per MPN holding the
+positions of the master and target items and a set of status flags. Category
+lists ("missing_items", "mismatched_quantity", ...) are lazy views built from
+those records on first access, and to_dict() produces the original dictionary
+shape for JSON reports and other consumers.
+"""
+from collections.abc import Sequence
+from enum import IntFlag
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .models import BOMItem
+
+class Status(IntFlag):
+    """Status flags of an MPN record. A record can carry several DIFF_* flags."""
+    MATCHED = 1
+    MISSING = 2
+    EXTRA = 4
+    DIFF_QUANTITY = 8
+    DIFF_DESCRIPTION = 16
+    DIFF_REFDES = 32
+    COSMETIC_DESCRIPTION = 64
+    LIKELY_RENAMED = 128
+
+# Result categories in report order, with the flag that selects their records.
+CATEGORY_FLAGS = {
+    "missing_items": Status.MISSING,
+    "extra_items": Status.EXTRA,
+    "mismatched_quantity": Status.DIFF_QUANTITY,
+    "mismatched_description": Status.DIFF_DESCRIPTION,
+    "mismatched_refdes": Status.DIFF_REFDES,
+    "matched": Status.MATCHED,
+    "likely_renamed": Status.LIKELY_RENAMED,
+    "cosmetic_description": Status.COSMETIC_DESCRIPTION,
+}
+# Categories that are only reported when the compare_boms() option producing
+# them is enabled (fuzzy_mpn and description_mode="semantic").
+OPTIONAL_CATEGORIES = frozenset({"likely_renamed", "cosmetic_description"})
+
+class MPNRecord(NamedTuple):
+    """
+    The comparison outcome for one MPN.
+
+    master_index and target_index are positions in the result's master_items
+    and target_items (None when the MPN is absent on that side). For a likely
+    renamed part, target_index points at the renamed target item.
+    """
+    mpn: str
+    master_index: Optional[int]
+    target_index: Optional[int]
+    status: Status
+    similarity: Optional[float] = None
+
+class CategoryView(Sequence):
+    """
+    A lazy, read-only list of the entries of one result category.
+
+    The matching records are selected on first access; entries are built in
+    the same shape as the original comparison dictionary when they are read.
+    """
+    def __init__(self, result: "ComparisonResult", name: str):
+        self._result = result
+        self.name = name
+        self._flag = CATEGORY_FLAGS[name]
+        self._records: Optional[List[MPNRecord]] = None
+
+    def _selected(self) -> List[MPNRecord]:
+        if self._records is None:
+            self._records = [record for record in self._result if record.status & self._flag]
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self._selected())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._result.entry(self.name, record) for record in self._selected()[index]]
+        return self._result.entry(self.name, self._selected()[index])
+
+    def __repr__(self) -> str:
+        return f"<CategoryView {self.name}: {len(self)} entries>"
+
+def _category_property(name: str) -> property:
+    return property(lambda self: self.category(name), doc=f"Lazy view of the '{name}' category.")
+
+class ComparisonResult:
+    """
+    The result of comparing a master BOM against a target BOM.
+
+    Records are stored in a dictionary keyed by MPN and are added in sorted MPN
+    order, so lookups by MPN are O(1) and iteration yields records sorted by
+    MPN without re-sorting.
+
+    `optional_categories` names the OPTIONAL_CATEGORIES that to_dict() reports;
+    the others are left out of the report (their views are still available).
+    """
+    def __init__(self, master_items: Sequence, target_items: Sequence, optional_categories: Iterable[str] = ()):
+        self.master_items = master_items
+        self.target_items = target_items
+        self.optional_categories = frozenset(optional_categories)
+        self._records: Dict[str, MPNRecord] = {}
+        self._views: Dict[str, CategoryView] = {}
+
+    def add(
+        self,
+        mpn: str,
+        master_index: Optional[int],
+        target_index: Optional[int],
+        status: Status,
+        similarity: Optional[float] = None,
+    ) -> None:
+        """
+        Adds the record of an MPN. New MPNs must be added in sorted MPN order;
+        adding an existing MPN replaces its record in place.
+        """
+        self._records[mpn] = MPNRecord(mpn, master_index, target_index, status, similarity)
+        if self._views:
+            self._views.clear()
+
+    def remove(self, mpn: str) -> None:
+        """Removes the record of an MPN (e.g. a target item reconciled as a rename)."""
+        del self._records[mpn]
+        self._views.clear()
+
+    # --- Per-MPN access ---
+
+    def lookup(self, mpn: str) -> Optional[MPNRecord]:
+        """Returns the record of an MPN (keyed by the master MPN for renamed parts)."""
+        return self._records.get(mpn)
+
+    def __contains__(self, mpn) -> bool:
+        return mpn in self._records
+
+    def __iter__(self) -> Iterator[MPNRecord]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def master_item(self, record: MPNRecord) -> Optional[BOMItem]:
+        return self.master_items[record.master_index] if record.master_index is not None else None
+
+    def target_item(self, record: MPNRecord) -> Optional[BOMItem]:
+        return self.target_items[record.target_index] if record.target_index is not None else None
+
+    # --- Category views ---
+
+    def category(self, name: str) -> CategoryView:
+        """Returns the lazy view of a category (a key of CATEGORY_FLAGS)."""
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = CategoryView(self, name)
+        return view
+
+    missing_items = _category_property("missing_items")
+    extra_items = _category_property("extra_items")
+    mismatched_quantity = _category_property("mismatched_quantity")
+    mismatched_description = _category_property("mismatched_description")
+    mismatched_refdes = _category_property("mismatched_refdes")
+    matched = _category_property("matched")
+    likely_renamed = _category_property("likely_renamed")
+    cosmetic_description = _category_property("cosmetic_description")
+
+    def entry(self, name: str, record: MPNRecord) -> Dict[str, Any]:
+        """Builds the entry of a record in a category, in the original report shape."""
+        master_item = self.master_item(record)
+        target_item = self.target_item(record)
+        if name in ("missing_items", "matched"):
+            return master_item
+        if name == "extra_items":
+            return target_item
+        if name == "likely_renamed":
+            return {
+                'MPN': record.mpn,
+                'target_MPN': target_item['MPN'],
+                'similarity': record.similarity,
+                'master_item': master_item,
+                'target_item': target_item
+            }
+
+        entry = {'MPN': record.mpn, 'master_item': master_item, 'target_item': target_item}
+        if name == "mismatched_refdes":
+            master_refdes = set(master_item['RefDes'])
+            target_refdes = set(target_item['RefDes'])
+            entry['added_refdes'] = sorted(target_refdes - master_refdes)
+            entry['removed_refdes'] = sorted(master_refdes - target_refdes)
+        return entry
+
+    def counts(self) -> Dict[str, int]:
+        """Counts the records of every category in a single pass."""
+        counts = dict.fromkeys(CATEGORY_FLAGS, 0)
+        for record in self._records.values():
+            for name, flag in CATEGORY_FLAGS.items():
+                if record.status & flag:
+                    counts[name] += 1
+        return counts
+
+    def reported_categories(self) -> List[str]:
+        """Returns the names of the categories reported by to_dict(), in report order."""
+        return [
+            name for name in CATEGORY_FLAGS
+            if name not in OPTIONAL_CATEGORIES or name in self.optional_categories
+        ]
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Returns the result as the original dictionary of category lists."""
+        return {name: list(self.category(name)) for name in self.reported_categories()}
+
+    # --- Pickling ---
+
+    def __getstate__(self):
+        # Only the referenced items are kept, and as plain lists, so results
+        # built on a memory-mapped master can be sent between processes.
+        master_items: List[BOMItem] = []
+        target_items: List[BOMItem] = []
+        records = {}
+        for mpn, record in self._records.items():
+            master_index = target_index = None
+            if record.master_index is not None:
+                master_index = len(master_items)
+                master_items.append(self.master_items[record.master_index])
+            if record.target_index is not None:
+                target_index = len(target_items)
+                target_items.append(self.target_items[record.target_index])
+            records[mpn] = record._replace(master_index=master_index, target_index=target_index)
+        return {
+            "master_items": master_items,
+            "target_items": target_items,
+            "optional_categories": self.optional_categories,
+            "_records": records,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._views = {}
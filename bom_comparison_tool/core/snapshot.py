@@ -0,0 +1,288 @@
+"""
+Compiled Binary BOM Snapshots.
+
+This module writes a parsed BOM to a compact binary file that can be memory-mapped
+and queried without deserializing it. Several worker processes (or a long-running
+daemon) can open the same snapshot and share the master BOM through the OS page
+cache, instead of each holding its own parsed copy.
+
+File layout (all integers little-endian):
+
+    header    magic, version, counts, section offsets and the source file's identity
+    records   one fixed-width record per BOM line, in source order
+    index     record numbers sorted by MPN (one per unique MPN, last line wins)
+    refdes    (offset, length) entries into the string pool
+    pool      de-duplicated UTF-8 strings
+"""
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .models import BOMItem
+
+SNAPSHOT_MAGIC = b"BOMSNAP\0"
+SNAPSHOT_VERSION = 2
+
+# magic, version, record_count, index_count, refdes_count,
+# records_offset, index_offset, refdes_offset, pool_offset, pool_size,
+# source_size, source_mtime_ns, source_path_offset, source_path_length
+_HEADER = struct.Struct("<8sIIII5QQqII")
+# mpn_offset, mpn_length, description_offset, description_length,
+# quantity, refdes_start, refdes_count
+_RECORD = struct.Struct("<IIIIqII")
+# The leading mpn_offset, mpn_length fields of a record.
+_MPN_FIELD = struct.Struct("<II")
+_INDEX_ENTRY = struct.Struct("<I")
+_REFDES_ENTRY = struct.Struct("<II")
+
+class _StringPool:
+    """Accumulates de-duplicated UTF-8 strings and hands out (offset, length)."""
+    def __init__(self):
+        self._offsets: Dict[bytes, int] = {}
+        self._chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, text: str):
+        data = text.encode("utf-8")
+        offset = self._offsets.get(data)
+        if offset is None:
+            offset = self.size
+            self._offsets[data] = offset
+            self._chunks.append(data)
+            self.size += len(data)
+        return offset, len(data)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self._chunks)
+
+class SnapshotSource(NamedTuple):
+    """Identity of the file a snapshot was compiled from."""
+    path: str
+    size: int
+    mtime_ns: int
+
+def _source_of(source_path: str) -> SnapshotSource:
+    stat = os.stat(source_path)
+    return SnapshotSource(os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+
+def write_snapshot(items: List[BOMItem], snapshot_path: str, source_path: Optional[str] = None) -> None:
+    """
+    Compiles a list of BOM items into a binary snapshot file.
+
+    The file is written to a temporary path and moved into place, so readers
+    never observe a partially written snapshot.
+
+    Args:
+        items: The parsed BOM items, in source order.
+        snapshot_path: The path of the snapshot file to create.
+        source_path: The file the items were parsed from. Its path, size and
+            modification time are recorded so that a reused snapshot can be
+            checked against it (see snapshot_matches_source()).
+    """
+    source = _source_of(source_path) if source_path else SnapshotSource("", 0, 0)
+    pool = _StringPool()
+    source_path_offset, source_path_length = pool.add(source.path)
+    records = bytearray()
+    refdes_table = bytearray()
+    refdes_count = 0
+    last_record_by_mpn: Dict[bytes, int] = {}
+
+    for record_number, item in enumerate(items):
+        mpn_offset, mpn_length = pool.add(item['MPN'])
+        desc_offset, desc_length = pool.add(item['Description'])
+        for refdes in item['RefDes']:
+            refdes_table += _REFDES_ENTRY.pack(*pool.add(refdes))
+        records += _RECORD.pack(
+            mpn_offset, mpn_length, desc_offset, desc_length,
+            item['Quantity'], refdes_count, len(item['RefDes'])
+        )
+        refdes_count += len(item['RefDes'])
+        # Like the comparator's MPN map, the last line of a duplicated MPN wins.
+        last_record_by_mpn[item['MPN'].encode("utf-8")] = record_number
+
+    index = b"".join(
+        _INDEX_ENTRY.pack(last_record_by_mpn[mpn]) for mpn in sorted(last_record_by_mpn)
+    )
+
+    records_offset = _HEADER.size
+    index_offset = records_offset + len(records)
+    refdes_offset = index_offset + len(index)
+    pool_offset = refdes_offset + len(refdes_table)
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(items), len(last_record_by_mpn), refdes_count,
+        records_offset, index_offset, refdes_offset, pool_offset, pool.size,
+        source.size, source.mtime_ns, source_path_offset, source_path_length
+    )
+
+    temp_path = f"{snapshot_path}.tmp{os.getpid()}"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(index)
+        f.write(refdes_table)
+        f.write(pool.to_bytes())
+    os.replace(temp_path, snapshot_path)
+
+class _RecordsView(Sequence):
+    """A lazy sequence of a snapshot's BOM lines, decoded on access."""
+    def __init__(self, snapshot: "BOMSnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self._snapshot.record_count
+
+    def __getitem__(self, record_number):
+        if isinstance(record_number, slice):
+            return [self._snapshot.record(i) for i in range(*record_number.indices(len(self)))]
+        return self._snapshot.record(record_number)
+
+class BOMSnapshot(Mapping):
+    """
+    A read-only, memory-mapped view of a compiled BOM snapshot.
+
+    The snapshot behaves as a mapping from MPN to BOMItem (iterating in sorted
+    MPN order), so it can be passed to compare_boms() in place of a list. Items
+    are decoded on access; nothing is loaded up front beyond the header.
+    """
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        with open(snapshot_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"Not a BOM snapshot: {snapshot_path}")
+        (magic, version, self.record_count, self._index_count, self._refdes_count,
+         self._records_offset, self._index_offset, self._refdes_offset,
+         self._pool_offset, _, source_size, source_mtime_ns,
+         source_path_offset, source_path_length) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a BOM snapshot (or unsupported version): {snapshot_path}")
+        source_path = self._string(source_path_offset, source_path_length)
+        # The file the snapshot was compiled from, or None if it was not recorded.
+        self.source = SnapshotSource(source_path, source_size, source_mtime_ns) if source_path else None
+
+    # --- Low-level accessors ---
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._pool_offset + offset
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _record_fields(self, record_number: int):
+        return _RECORD.unpack_from(self._mmap, self._records_offset + record_number * _RECORD.size)
+
+    def _index_record(self, position: int) -> int:
+        return _INDEX_ENTRY.unpack_from(self._mmap, self._index_offset + position * _INDEX_ENTRY.size)[0]
+
+    def _mpn_bytes(self, record_number: int) -> bytes:
+        mpn_offset, mpn_length = self._record_fields(record_number)[:2]
+        start = self._pool_offset + mpn_offset
+        return self._mmap[start:start + mpn_length]
+
+    # --- Public API ---
+
+    def record(self, record_number: int) -> BOMItem:
+        """Decodes the BOM line at the given position in source order."""
+        if not 0 <= record_number < self.record_count:
+            raise IndexError(record_number)
+        (mpn_offset, mpn_length, desc_offset, desc_length,
+         quantity, refdes_start, refdes_count) = self._record_fields(record_number)
+        refdes = []
+        for i in range(refdes_start, refdes_start + refdes_count):
+            refdes.append(self._string(*_REFDES_ENTRY.unpack_from(
+                self._mmap, self._refdes_offset + i * _REFDES_ENTRY.size
+            )))
+        return BOMItem(
+            MPN=self._string(mpn_offset, mpn_length),
+            Quantity=quantity,
+            RefDes=refdes,
+            Description=self._string(desc_offset, desc_length)
+        )
+
+    @property
+    def records(self) -> Sequence:
+        """All BOM lines in source order, as a lazy sequence indexed by record number."""
+        return _RecordsView(self)
+
+    def iter_index(self) -> Iterator[Tuple[bytes, int]]:
+        """Yields (UTF-8 encoded MPN, record number) for every unique MPN, sorted by MPN."""
+        mm = self._mmap
+        records_offset, pool_offset = self._records_offset, self._pool_offset
+        unpack_mpn_field = _MPN_FIELD.unpack_from
+        index = memoryview(mm)[self._index_offset:self._index_offset + self._index_count * _INDEX_ENTRY.size]
+        try:
+            for (record_number,) in _INDEX_ENTRY.iter_unpack(index):
+                mpn_offset, mpn_length = unpack_mpn_field(mm, records_offset + record_number * _RECORD.size)
+                start = pool_offset + mpn_offset
+                yield mm[start:start + mpn_length], record_number
+        finally:
+            index.release()  # An exported buffer would keep close() from unmapping the file.
+
+    def iter_records(self) -> Iterator[BOMItem]:
+        """Yields every BOM line in source order, including duplicated MPNs."""
+        for record_number in range(self.record_count):
+            yield self.record(record_number)
+
+    def find(self, mpn: str) -> Optional[int]:
+        """Binary-searches the MPN index and returns the record number, or None."""
+        key = mpn.encode("utf-8")
+        low, high = 0, self._index_count
+        while low < high:
+            middle = (low + high) // 2
+            record_number = self._index_record(middle)
+            if self._mpn_bytes(record_number) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._index_count:
+            record_number = self._index_record(low)
+            if self._mpn_bytes(record_number) == key:
+                return record_number
+        return None
+
+    def __getitem__(self, mpn: str) -> BOMItem:
+        record_number = self.find(mpn)
+        if record_number is None:
+            raise KeyError(mpn)
+        return self.record(record_number)
+
+    def __contains__(self, mpn) -> bool:
+        return isinstance(mpn, str) and self.find(mpn) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._index_count):
+            yield self._mpn_bytes(self._index_record(position)).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._index_count
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_snapshot(snapshot_path: str) -> BOMSnapshot:
+    """Opens a compiled snapshot for zero-copy lookups."""
+    return BOMSnapshot(snapshot_path)
+
+def snapshot_matches_source(snapshot_path: str, source_path: str) -> bool:
+    """
+    Checks whether a snapshot was compiled from the current contents of a file.
+
+    The snapshot must exist, be readable, and record the same absolute path,
+    size and modification time as the source file has now.
+    """
+    if not os.path.exists(snapshot_path):
+        return False
+    try:
+        with open_snapshot(snapshot_path) as snapshot:
+            return snapshot.source == _source_of(source_path)
+    except (ValueError, OSError):
+        return False
@@ -6,11 +6,18 @@ parts of the application, such as file I/O operations.
 """
 import json
 
+def _to_json(value):
+    """Serializes objects json does not know natively (e.g. a ComparisonResult)."""
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 def save_json(data: dict, file_name: str = "comparison_result.json"):
     """
     Saves a dictionary to a JSON file with pretty printing.
 
     This ensures the output is human-readable and can be easily parsed later.
+    Comparison results are written in their dictionary form (to_dict()).
 
     Args:
         data: The dictionary payload to save.
@@ -21,7 +28,7 @@ def save_json(data: dict, file_name: str = "comparison_result.json"):
     """
     try:
         with open(file_name, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+            json.dump(data, f, indent=4, default=_to_json)
         print(f"\nFull comparison report saved successfully to: {file_name}")
     except IOError as e:
         print(f"\nError: Could not write JSON report to {file_name}. Reason: {e}")
@@ -10,7 +10,8 @@ outputs the results to the console and a JSON report.
 Flow:
 1. Launches a GUI for file selection.
 2. Loads and normalizes the master BOM file.
-3. Iterates through each target file:
+3. Iterates through each target file (optionally in parallel worker processes
+   that share the master BOM through a memory-mapped snapshot):
     a. Loads and normalizes the target BOM.
     b. Compares it against the master BOM.
     c. Prints a summary of differences (counts).
@@ -20,23 +21,139 @@ Flow:
 """
 import argparse
 import json
-from typing import Dict, Any
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple, Union
 
 # It's conventional to place imports from your own project after standard library imports.
-from core.parsers import parse_bom_file
+from core.parsers import parse_bom_file, expand_archive_targets
+from core.isolation import parse_bom_file_isolated
 from core.comparator import compare_boms
 from core.formatter import format_summary, format_comparison_as_table
 from core.models import BOMItem, ErrorDict
+from core.result import ComparisonResult
+from core.snapshot import write_snapshot, open_snapshot, snapshot_matches_source
+from core.history import RevisionStore
+from core.catalog import open_catalog
+from core.impact import compute_impact
 from core.utils import save_json
-from ui_file_selector import launch_file_selector # Import the new UI function
+from ui_file_selector import launch_file_selector, launch_comparison_app # Import the new UI functions
+
+# The memory-mapped master BOM shared by all comparisons in a worker process.
+_worker_master = None
+
+def _parse(file_path: str, parse_options: Dict[str, Any], cancel_event: Optional[threading.Event] = None):
+    """
+    Parses a BOM file, in an isolated worker process if requested.
+
+    With a cancel event (the interactive window) the file is always parsed in a
+    worker process, so that cancelling can kill it; the time and memory limits
+    still only apply with --isolate.
+    """
+    if parse_options.get("isolate"):
+        return parse_bom_file_isolated(
+            file_path, timeout=parse_options["timeout"], memory_limit_mb=parse_options["memory_limit_mb"],
+            cancel_event=cancel_event
+        )
+    if cancel_event is not None:
+        return parse_bom_file_isolated(file_path, timeout=None, memory_limit_mb=None, cancel_event=cancel_event)
+    return parse_bom_file(file_path)
+
+def _cancellable_parser(parse_options: Dict[str, Any]) -> Callable[[str, threading.Event], Any]:
+    """Returns the parse_file(file_path, cancel_event) callable used by the comparison window."""
+    return lambda file_path, cancel_event: _parse(file_path, parse_options, cancel_event)
+
+def _compare_target(
+    master_bom, target_file: str, compare_options: Dict[str, Any], parse_options: Dict[str, Any],
+    keep_items: bool = False
+) -> Tuple[Optional[List[BOMItem]], Union[ComparisonResult, Dict[str, Any]]]:
+    """
+    Parses one target file and compares it against the master BOM.
+
+    Returns:
+        A tuple of (target_items, comparison_result). The comparison result is
+        a plain error dictionary if the target could not be parsed. The parsed
+        target items are only returned when `keep_items` is set (e.g. for the
+        history store).
+    """
+    target_bom = _parse(target_file, parse_options)
+    if 'error' in target_bom:
+        error = {"error": target_bom['error']}
+        if 'kind' in target_bom:
+            error["kind"] = target_bom['kind']
+        return None, error
+    return (target_bom if keep_items else None), compare_boms(master_bom, target_bom, **compare_options)
+
+def _init_worker(snapshot_path: str):
+    """Opens the master snapshot once per worker process."""
+    global _worker_master
+    _worker_master = open_snapshot(snapshot_path)
+
+def _compare_target_in_worker(
+    target_file: str, compare_options: Dict[str, Any], parse_options: Dict[str, Any], keep_items: bool
+):
+    """Worker-process entry point comparing a target against the shared master."""
+    return (target_file,) + _compare_target(_worker_master, target_file, compare_options, parse_options, keep_items)
+
+def _compare_targets_in_parallel(
+    snapshot_path: str, target_files: List[str], compare_options: Dict[str, Any],
+    parse_options: Dict[str, Any], workers: int, keep_items: bool
+) -> Iterator[Tuple[str, Optional[List[BOMItem]], Union[ComparisonResult, Dict[str, Any]]]]:
+    """Compares targets in worker processes that share the master via mmap."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshot_path,)) as executor:
+        futures = [
+            executor.submit(_compare_target_in_worker, target_file, compare_options, parse_options, keep_items)
+            for target_file in target_files
+        ]
+        for future in futures:
+            yield future.result()
 
 def main():
     """Main function to drive the BOM comparison tool."""
     # Argument parser for optional output file name
     parser = argparse.ArgumentParser(description="BOM Comparison Tool with GUI file selection.")
     parser.add_argument("-o", "--output", default="comparison_output.json", help="Path to save the final JSON comparison report.")
+    parser.add_argument("--fuzzy-mpn", action="store_true", help="Reconcile missing/extra MPNs that differ only by case, separators or spelling and report them as likely renamed.")
+    parser.add_argument("--similarity-threshold", type=float, default=0.8, help="Minimum MPN similarity (0-1) used by --fuzzy-mpn. Defaults to 0.8.")
+    parser.add_argument("--description-mode", choices=["exact", "semantic"], default="exact", help="'exact' flags any Description difference; 'semantic' compares normalized values and reports cosmetic differences separately.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes used to compare target files. Workers share the master BOM through a memory-mapped snapshot.")
+    parser.add_argument("--snapshot", help="Path of a compiled master snapshot. It is reused if it was compiled from the current master file (same path, size and modification time), otherwise (re)written.")
+    parser.add_argument("--history-db", help="Path of a SQLite revision history store. The master and every parsed target are ingested as revisions labelled with their file name; a file whose items are unchanged since its last ingestion (same path and content) is not stored again. Labels are base names, so files with the same name in different directories share a label (a label refers to its most recent revision; use revision ids or sources to tell them apart).")
+    parser.add_argument("--isolate", action="store_true", help="Parse each file in a resource-limited worker process so a pathological file cannot stall the batch.")
+    parser.add_argument("--parse-timeout", type=float, default=120.0, help="Wall-clock limit in seconds per parsing attempt with --isolate. Defaults to 120.")
+    parser.add_argument("--memory-limit", type=int, default=2048, help="Memory limit in MB per parsing worker with --isolate. Defaults to 2048.")
+    parser.add_argument("--catalog", help="Path of a local parts catalog (CSV or SQLite) with unit cost and stock per MPN. Adds cost deltas and out-of-stock additions to each summary and report. A CSV catalog is indexed once into '<catalog>.catalog.sqlite'.")
+    parser.add_argument("--interactive", action="store_true", help="Run the comparison inside the GUI with progress, cancellation and a filterable results view. --workers, --snapshot and --history-db do not apply in this mode.")
     args = parser.parse_args()
 
+    parse_options = {
+        "isolate": args.isolate,
+        "timeout": args.parse_timeout,
+        "memory_limit_mb": args.memory_limit,
+    }
+    compare_options = {
+        "fuzzy_mpn": args.fuzzy_mpn,
+        "similarity_threshold": args.similarity_threshold,
+        "description_mode": args.description_mode,
+    }
+
+    if args.interactive:
+        print("Launching comparison GUI...")
+        report = launch_comparison_app(
+            _cancellable_parser(parse_options), compare_options, catalog_path=args.catalog
+        )
+        if report is None:
+            print("No comparison was run. Exiting.")
+            return
+        if report.get("cancelled"):
+            print(f"Comparison cancelled after {len(report['comparisons'])} target file(s); saving the partial report.")
+        save_json(report, args.output)
+        return
+
     # 1. Launch GUI for file selection
     print("Launching file selection GUI...")
     master_file, target_files = launch_file_selector()
@@ -45,12 +162,48 @@ def main():
         print("File selection cancelled by user. Exiting.")
         return
 
-    # 2. Load Master BOM
-    print(f"Loading master BOM: {master_file}")
-    master_bom = parse_bom_file(master_file)
-    if 'error' in master_bom:
-        print(f"Fatal Error: Could not parse master file. Reason: {master_bom['error']}")
-        return
+    # Zip bundles become one target per member, so members can be compared in parallel.
+    target_files = expand_archive_targets(target_files)
+
+    # The catalog is opened before any other resource, so a bad path fails fast.
+    catalog = None
+    if args.catalog:
+        print(f"Loading parts catalog: {args.catalog}")
+        try:
+            catalog = open_catalog(args.catalog)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Fatal Error: Could not open parts catalog. Reason: {e}")
+            return
+
+    # 2. Load Master BOM (from a compiled snapshot when one is available)
+    temp_dir = None
+    snapshot_path = args.snapshot
+    if snapshot_path is None and args.workers > 1:
+        temp_dir = tempfile.mkdtemp(prefix="bom_snapshot_")
+        snapshot_path = os.path.join(temp_dir, "master.bomsnap")
+
+    if snapshot_path and snapshot_matches_source(snapshot_path, master_file):
+        print(f"Loading master BOM snapshot: {snapshot_path}")
+    else:
+        print(f"Loading master BOM: {master_file}")
+        master_bom = _parse(master_file, parse_options)
+        if 'error' in master_bom:
+            print(f"Fatal Error: Could not parse master file. Reason: {master_bom['error']}")
+            if catalog:
+                catalog.close()
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        if snapshot_path:
+            write_snapshot(master_bom, snapshot_path, source_path=master_file)
+
+    if snapshot_path:
+        master_bom = open_snapshot(snapshot_path)
+
+    history = RevisionStore(args.history_db) if args.history_db else None
+    if history:
+        master_items = master_bom.iter_records() if snapshot_path else master_bom
+        history.ingest(os.path.basename(master_file), master_items, source=master_file, skip_unchanged=True)
 
     # This will hold the final data for the JSON output
     final_report = {
@@ -58,45 +211,69 @@ def main():
         "comparisons": []
     }
 
-    # 3. Loop through and process each target file
-    for target_file in target_files:
-        print("\n" + "="*80)
-        print(f"PROCESSING: {target_file}")
-        print("="*80)
-
-        # 4. Load Target BOM
-        target_bom = parse_bom_file(target_file)
-        if 'error' in target_bom:
-            print(f"  -> Error parsing target file: {target_bom['error']}")
-            final_report["comparisons"].append({
-                "target_file": target_file,
-                "result": {"error": target_bom['error']}
-            })
-            continue
+    # 3. Parse and compare each target file (in worker processes if requested)
+    if args.workers > 1:
+        results = _compare_targets_in_parallel(
+            snapshot_path, target_files, compare_options, parse_options, args.workers, keep_items=history is not None
+        )
+    else:
+        results = (
+            (target_file,) + _compare_target(
+                master_bom, target_file, compare_options, parse_options, keep_items=history is not None
+            )
+            for target_file in target_files
+        )
+
+    try:
+        for target_file, target_bom, comparison_result in results:
+            print("\n" + "="*80)
+            print(f"PROCESSING: {target_file}")
+            print("="*80)
 
-        # 5. Compare master with the current target
-        comparison_result = compare_boms(master_bom, target_bom)
+            # 4. Report target files that could not be parsed
+            if isinstance(comparison_result, dict):
+                print(f"  -> Error parsing target file: {comparison_result['error']}")
+                final_report["comparisons"].append({
+                    "target_file": target_file,
+                    "result": comparison_result
+                })
+                continue
 
-        # 6. Print the results to the console using the new formatter
-        summary_str = format_summary(comparison_result)
-        table_str = format_comparison_as_table(comparison_result)
+            if history:
+                history.ingest(os.path.basename(target_file), target_bom, source=target_file, skip_unchanged=True)
 
-        print(summary_str)
-        print("\n" + "-"*80)
-        print("DETAILED COMPARISON")
-        print("-" * 80)
-        print(table_str)
+            # 5. Print the results to the console using the new formatter
+            impact = compute_impact(comparison_result, catalog) if catalog else None
+            summary_str = format_summary(comparison_result, impact)
+            table_str = format_comparison_as_table(comparison_result)
 
+            print(summary_str)
+            print("\n" + "-"*80)
+            print("DETAILED COMPARISON")
+            print("-" * 80)
+            print(table_str)
 
-        # 7. Store the full result for the final JSON report
-        final_report["comparisons"].append({
-            "target_file": target_file,
-            "result": comparison_result
-        })
 
-    # 8. Save the full comparison report to a JSON file using the utility function
+            # 6. Store the full result for the final JSON report
+            comparison_entry = {
+                "target_file": target_file,
+                "result": comparison_result
+            }
+            if impact is not None:
+                comparison_entry["impact"] = impact
+            final_report["comparisons"].append(comparison_entry)
+    finally:
+        if snapshot_path:
+            master_bom.close()
+        if history:
+            history.close()
+        if catalog:
+            catalog.close()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # 7. Save the full comparison report to a JSON file using the utility function
     save_json(final_report, args.output)
 
 if __name__ == "__main__":
     main()
-
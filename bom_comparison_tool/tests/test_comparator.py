@@ -0,0 +1,153 @@
+import pickle
+import time
+import pytest
+from bom_comparison_tool.core.comparator import compare_boms
+from bom_comparison_tool.core.description import classify_description_difference, CHANGED, COSMETIC
+from bom_comparison_tool.core.formatter import format_summary
+from bom_comparison_tool.core.mpn_matcher import find_likely_renamed, normalize_mpn
+from bom_comparison_tool.core.models import BOMItem
+from bom_comparison_tool.core.result import ComparisonResult, Status
+
+def make_item(mpn, quantity=1, refdes=None, description=""):
+    return BOMItem(MPN=mpn, Quantity=quantity, RefDes=refdes or [], Description=description)
+
+# Test case for MPN canonicalization
+def test_normalize_mpn():
+    assert normalize_mpn("RC0603FR-0710KL") == "RC0603FR0710KL"
+    assert normalize_mpn(" rc0603fr.0710kl ") == "RC0603FR0710KL"
+    assert normalize_mpn("TI:LM358DR") == "LM358DR"
+
+# Test case for exact matching (fuzzy matching disabled)
+def test_compare_without_fuzzy_mpn():
+    master = [make_item("RC0603FR-0710KL")]
+    target = [make_item("rc0603fr0710kl")]
+
+    result = compare_boms(master, target)
+
+    assert len(result.missing_items) == 1
+    assert len(result.extra_items) == 1
+    assert list(result.likely_renamed) == []
+
+# Test case for fuzzy reconciliation of missing/extra items
+def test_compare_with_fuzzy_mpn():
+    master = [make_item("RC0603FR-0710KL"), make_item("GRM188R71H104KA93D"), make_item("LM358DR")]
+    target = [make_item("rc0603fr0710kl"), make_item("GRM188R71H104KA93J"), make_item("BAT54S")]
+
+    result = compare_boms(master, target, fuzzy_mpn=True)
+
+    renamed = {item['MPN']: item for item in result.likely_renamed}
+    assert renamed["RC0603FR-0710KL"]['target_MPN'] == "rc0603fr0710kl"
+    assert renamed["RC0603FR-0710KL"]['similarity'] == 1.0
+    assert renamed["GRM188R71H104KA93D"]['target_MPN'] == "GRM188R71H104KA93J"
+    assert [item['MPN'] for item in result.missing_items] == ["LM358DR"]
+    assert [item['MPN'] for item in result.extra_items] == ["BAT54S"]
+
+# Test case for field differences on a likely renamed part
+def test_renamed_pair_is_checked_for_differences():
+    master = [make_item("RC0603FR-0710KL", 10, ["R1", "R2"], "Resistor 10k")]
+    target = [make_item("rc0603fr0710kl", 4, ["R1"], "Resistor 22k")]
+
+    result = compare_boms(master, target, fuzzy_mpn=True)
+
+    record = result.lookup("RC0603FR-0710KL")
+    assert record.status == (
+        Status.LIKELY_RENAMED | Status.DIFF_QUANTITY | Status.DIFF_DESCRIPTION | Status.DIFF_REFDES
+    )
+    assert result.mismatched_refdes[0]['removed_refdes'] == ["R2"]
+    assert "Mismatched Quantity: 1" in format_summary(result)
+
+# Test case for MPNs that differ inside a value code (different parts)
+def test_value_code_changes_are_not_renames():
+    master = [make_item("RC0603FR-0710KL"), make_item("GRM188R71H104KA93D")]
+    target = [make_item("RC0603FR-0720KL"), make_item("GRM188R71H103KA93D")]
+
+    result = compare_boms(master, target, fuzzy_mpn=True)
+
+    assert list(result.likely_renamed) == []
+    assert len(result.missing_items) == 2
+    assert len(result.extra_items) == 2
+
+# Test case for fuzzy matching cost growing close to linearly with the number of MPNs
+def test_fuzzy_matching_scales():
+    def run(count):
+        missing = [make_item(f"RC0603FR-07{i}KL") for i in range(count)]
+        extra = [make_item(f"RC0603FR-07{i}KLX") for i in range(count)]
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            pairs = find_likely_renamed(missing, extra)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        assert len(pairs) == count
+        return best
+
+    # Comparing every missing MPN with every extra one would be 16x slower.
+    assert run(4000) < 10 * run(1000)
+
+# Test case for semantic description comparison
+def test_compare_semantic_descriptions():
+    master = [
+        make_item("PART-001", description="Resistor 10k 1%"),
+        make_item("PART-002", description="CAP 100nF 50V"),
+        make_item("PART-003", description="RES 10k 1/4W 0603"),
+        make_item("PART-004", description="Resistor 10k 1%"),
+        make_item("PART-005", description="RES 10k 1/4W 0603"),
+    ]
+    target = [
+        make_item("PART-001", description="RES 10K OHM 1% 0603"),
+        make_item("PART-002", description="Capacitor 10nF 50V"),
+        make_item("PART-003", description="RES 10k 4W 0603"),  # 0.25 W -> 4 W
+        make_item("PART-004", description="Resistor 1%"),      # The resistance was dropped
+        make_item("PART-005", description="Resistor 10K 0.25W 0603"),
+    ]
+
+    exact = compare_boms(master, target)
+    assert len(exact.mismatched_description) == 5
+
+    semantic = compare_boms(master, target, description_mode="semantic")
+    assert [item['MPN'] for item in semantic.cosmetic_description] == ["PART-001", "PART-005"]
+    assert [item['MPN'] for item in semantic.mismatched_description] == ["PART-002", "PART-003", "PART-004"]
+    assert [item['MPN'] for item in semantic.matched] == ["PART-001", "PART-005"]
+
+# Test case for per-MPN lookup, flags and pickling of the result
+def test_comparison_result_records():
+    master = [make_item("PART-002", 2, ["C1"]), make_item("PART-001", 1, ["R1"]), make_item("PART-003")]
+    target = [make_item("PART-001", 1, ["R1"]), make_item("PART-002", 3, ["C2"]), make_item("PART-004")]
+
+    result = compare_boms(master, target)
+
+    assert [record.mpn for record in result] == ["PART-001", "PART-002", "PART-003", "PART-004"]
+    assert result.lookup("PART-001").status == Status.MATCHED
+    assert result.lookup("PART-002").status == Status.DIFF_QUANTITY | Status.DIFF_REFDES
+    assert result.lookup("PART-003").target_index is None
+    assert result.lookup("PART-999") is None
+    assert result.mismatched_refdes[0]['added_refdes'] == ["C2"]
+    assert result.counts()['extra_items'] == 1
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert isinstance(restored, ComparisonResult)
+    assert restored.to_dict() == result.to_dict()
+
+# Test case for optional categories appearing only with their option enabled
+def test_optional_categories_in_report():
+    master = [make_item("PART-001")]
+    target = [make_item("part001")]
+
+    assert list(compare_boms(master, target).to_dict()) == [
+        "missing_items", "extra_items", "mismatched_quantity", "mismatched_description", "mismatched_refdes", "matched"
+    ]
+    fuzzy = compare_boms(master, target, fuzzy_mpn=True)
+    assert "likely_renamed" in fuzzy.to_dict() and "cosmetic_description" not in fuzzy.to_dict()
+    assert "likely_renamed" in pickle.loads(pickle.dumps(fuzzy)).to_dict()
+    assert "cosmetic_description" in compare_boms(master, target, description_mode="semantic").to_dict()
+
+# Test case for a value change where only one side names the category
+def test_semantic_unitless_value_against_category():
+    assert classify_description_difference("10k 0603", "Resistor 22k 0603") == CHANGED
+    assert classify_description_difference("10k 0603", "Resistor 10k 0603") == COSMETIC
+    assert classify_description_difference("10k 0603", "100nF 0603") == CHANGED
+
+# Test case for unknown description mode
+def test_compare_unknown_description_mode():
+    with pytest.raises(ValueError):
+        compare_boms([], [], description_mode="fuzzy")
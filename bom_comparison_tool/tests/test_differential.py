@@ -0,0 +1,326 @@
+"""
+Differential tests for alternative parsing and comparison engines.
+
+Randomized BOMs (duplicated MPNs, odd delimiters, unicode, empty RefDes, bad
+quantities) are run through every registered engine, and each engine's
+normalized output must equal the reference engine's. Per-engine timings are
+accumulated and reported as test-suite properties (visible with --junitxml).
+
+To put a new engine under test, add it to PARSE_ENGINES or COMPARE_ENGINES.
+"""
+import csv
+import gzip
+import io
+import os
+import pickle
+import random
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+
+import openpyxl
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from bom_comparison_tool.core.comparator import compare_boms
+from bom_comparison_tool.core.description import normalize_description
+from bom_comparison_tool.core.history import RevisionStore
+from bom_comparison_tool.core.isolation import parse_bom_file_isolated
+from bom_comparison_tool.core.models import BOMItem
+from bom_comparison_tool.core.parsers import ARCHIVE_MEMBER_SEP, parse_bom_file
+from bom_comparison_tool.core.snapshot import open_snapshot, write_snapshot
+
+# Total seconds spent in each engine, across all examples of this module.
+ENGINE_TIMINGS = defaultdict(float)
+
+@pytest.fixture(scope="module", autouse=True)
+def engine_timings(record_testsuite_property):
+    yield ENGINE_TIMINGS
+    for engine, seconds in sorted(ENGINE_TIMINGS.items()):
+        record_testsuite_property(f"engine_seconds.{engine}", round(seconds, 4))
+
+def _timed(engine, function, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        ENGINE_TIMINGS[engine] += time.perf_counter() - start
+
+# --- Engines ---
+
+def _parse_reference(file_path):
+    return parse_bom_file(file_path)
+
+def _parse_streaming(file_path):
+    return parse_bom_file(file_path, streaming=True)
+
+def _parse_gzip(file_path):
+    gz_path = file_path + ".gz"
+    with open(file_path, "rb") as f:
+        data = f.read()
+    with open(gz_path, "wb") as f:
+        f.write(gzip.compress(data))
+    return parse_bom_file(gz_path)
+
+def _parse_zip_member(file_path):
+    bundle_path = os.path.join(os.path.dirname(file_path), "bundle.zip")
+    member = os.path.basename(file_path)
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_DEFLATED) as bundle:
+        bundle.write(file_path, member)
+    return parse_bom_file(f"{bundle_path}{ARCHIVE_MEMBER_SEP}{member}")
+
+def _parse_isolated(file_path):
+    return parse_bom_file_isolated(file_path)
+
+# name -> function(file_path) returning a ParseResult.
+PARSE_ENGINES = {
+    "parse.reference": _parse_reference,
+    "parse.streaming": _parse_streaming,
+    "parse.gzip": _parse_gzip,
+    "parse.zip_member": _parse_zip_member,
+}
+# Engines that start a worker process per file; they run on fewer examples.
+SLOW_PARSE_ENGINES = {
+    "parse.isolated": _parse_isolated,
+}
+
+def _normalize_parse(result):
+    """Drops the path from errors; engines that wrap the file report a different one."""
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if key != 'file_path'}
+    return result
+
+def _compare_reference(master, target, options, work_dir):
+    return compare_boms(master, target, **options).to_dict()
+
+def _compare_snapshot(master, target, options, work_dir):
+    # The memory-mapped master shared by --workers/--snapshot runs.
+    snapshot_path = os.path.join(work_dir, "master.bomsnap")
+    write_snapshot(master, snapshot_path)
+    with open_snapshot(snapshot_path) as snapshot:
+        return compare_boms(snapshot, target, **options).to_dict()
+
+def _compare_pickled(master, target, options, work_dir):
+    # What a worker process sends back to the parent.
+    return pickle.loads(pickle.dumps(compare_boms(master, target, **options))).to_dict()
+
+def _compare_sql(master, target, options, work_dir):
+    with RevisionStore(os.path.join(work_dir, "history.sqlite")) as store:
+        master_id, target_id = store.ingest_many([("master", master, None), ("target", target, None)])
+        return store.diff(master_id, target_id)
+
+def _compare_cold_cache(master, target, options, work_dir):
+    # The reference runs first and warms the normalization cache; this run must not depend on it.
+    normalize_description.cache_clear()
+    return compare_boms(master, target, **options).to_dict()
+
+def _default_options_only(options):
+    return not options["fuzzy_mpn"] and options["description_mode"] == "exact"
+
+def _semantic_only(options):
+    return options["description_mode"] == "semantic"
+
+# name -> (function(master, target, options, work_dir), supports(options)).
+COMPARE_ENGINES = {
+    "compare.reference": (_compare_reference, lambda options: True),
+    "compare.snapshot": (_compare_snapshot, lambda options: True),
+    "compare.pickled": (_compare_pickled, lambda options: True),
+    "compare.sql": (_compare_sql, _default_options_only),
+    "compare.semantic_cold_cache": (_compare_cold_cache, _semantic_only),
+}
+
+def _normalize(result):
+    """Orders every reported category by MPN."""
+    return {
+        name: sorted(entries, key=lambda entry: (entry['MPN'], entry.get('target_MPN', '')))
+        for name, entries in result.items()
+    }
+
+# --- Strategies ---
+
+MPN_ALPHABET = "ABCDLMRSTX0123456789-./_ µΩüé中"
+
+mpns = st.one_of(
+    st.text(alphabet=MPN_ALPHABET, min_size=1, max_size=12).map(str.strip).filter(bool),
+    st.sampled_from(["DUP-001", "dup-001", "DUP001", "RC0603FR-0710KL"]),  # Frequent collisions and near-renames.
+)
+refdes_lists = st.lists(st.from_regex(r"[A-Z]{1,2}[1-9][0-9]{0,2}", fullmatch=True), max_size=4)
+descriptions = st.one_of(
+    st.sampled_from(["", "Resistor 10k 1%", "RES 10K OHM 1% 0603", "CAP 100nF 50V", "Capacitor 10nF 50V"]),
+    st.text(alphabet=st.characters(blacklist_categories=("Cs", "Cc")), max_size=20),
+)
+quantities = st.integers(min_value=-5, max_value=10**6)
+
+bom_items = st.builds(BOMItem, MPN=mpns, Quantity=quantities, RefDes=refdes_lists, Description=descriptions)
+
+@st.composite
+def bom_pairs(draw):
+    """A master BOM and a target derived from it by random edits, removals and additions."""
+    master = draw(st.lists(bom_items, max_size=25))
+    target = []
+    for item in master:
+        edit = draw(st.sampled_from(["keep", "drop", "quantity", "description", "refdes", "rename", "duplicate"]))
+        if edit == "drop":
+            continue
+        item = dict(item)
+        if edit == "quantity":
+            item['Quantity'] = draw(quantities)
+        elif edit == "description":
+            item['Description'] = draw(descriptions)
+        elif edit == "refdes":
+            item['RefDes'] = draw(refdes_lists)
+        elif edit == "rename":
+            item['MPN'] = item['MPN'].lower().replace("-", "")
+        elif edit == "duplicate":
+            target.append(dict(item, Quantity=draw(quantities)))
+        target.append(BOMItem(**item))
+    target.extend(draw(st.lists(bom_items, max_size=5)))
+    draw(st.randoms(use_true_random=False)).shuffle(target)
+    return master, target
+
+compare_options = st.fixed_dictionaries({
+    "fuzzy_mpn": st.booleans(),
+    "description_mode": st.sampled_from(["exact", "semantic"]),
+})
+
+HEADER_ALIASES = {
+    "MPN": ["MPN", "Part Number", "manufacturer part number"],
+    "Quantity": ["Qty", "Quantity", "QUANT"],
+    "RefDes": ["RefDes", "Designator", "ref des"],
+    "Description": ["Description", "Desc"],
+}
+# Cells that the parsers must turn into a quantity of 0 (or read as a number).
+quantity_cells = st.one_of(
+    quantities.map(str),
+    st.sampled_from(["", "abc", "1.5", " 7 ", "1e3", "N/A", "١٢"]),
+)
+refdes_delimiters = st.sampled_from([",", ", ", ";", " ", " ; "])
+
+@st.composite
+def bom_tables(draw):
+    """A header row (aliased, shuffled columns) plus data rows as lists of strings."""
+    columns = draw(st.permutations(list(HEADER_ALIASES)))
+    header = [draw(st.sampled_from(HEADER_ALIASES[column])) for column in columns]
+    rows = []
+    for item in draw(st.lists(bom_items, max_size=20)):
+        cells = {
+            "MPN": item['MPN'],
+            "Quantity": draw(quantity_cells),
+            "RefDes": draw(refdes_delimiters).join(item['RefDes']),
+            "Description": item['Description'],
+        }
+        rows.append([cells[column] for column in columns])
+    preamble = draw(st.lists(st.sampled_from([["Project: X-100"], ["Rev", "C"], []]), max_size=2))
+    return preamble + [header] + rows
+
+def _write_table(table, file_format, delimiter, file_path):
+    if file_format == "xlsx":
+        workbook = openpyxl.Workbook()
+        for row in table:
+            workbook.active.append(row)
+        workbook.save(file_path)
+        return
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=delimiter, lineterminator="\n").writerows(table)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(buffer.getvalue())
+
+# --- Properties ---
+
+@settings(max_examples=75, deadline=None)
+@given(pair=bom_pairs(), options=compare_options)
+def test_compare_engines_agree(pair, options):
+    master, target = pair
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = {
+            name: _normalize(_timed(name, engine, master, target, options, work_dir))
+            for name, (engine, supports) in COMPARE_ENGINES.items()
+            if supports(options)
+        }
+    expected = results.pop("compare.reference")
+    for name, result in results.items():
+        assert result == expected, f"{name} disagrees with compare.reference"
+
+@settings(max_examples=40, deadline=None)
+@given(
+    table=bom_tables(),
+    file_format=st.sampled_from(["csv", "tsv", "txt", "xlsx"]),
+    delimiter=st.sampled_from([",", ";", "\t", "|"]),
+)
+def test_parse_engines_agree(table, file_format, delimiter):
+    _check_parse_engines(PARSE_ENGINES, table, file_format, delimiter)
+
+@settings(max_examples=8, deadline=None)
+@given(
+    table=bom_tables(),
+    file_format=st.sampled_from(["csv", "tsv", "txt", "xlsx"]),
+    delimiter=st.sampled_from([",", ";", "\t", "|"]),
+)
+def test_slow_parse_engines_agree(table, file_format, delimiter):
+    _check_parse_engines(SLOW_PARSE_ENGINES, table, file_format, delimiter)
+
+def _check_parse_engines(engines, table, file_format, delimiter):
+    with tempfile.TemporaryDirectory() as work_dir:
+        file_path = os.path.join(work_dir, f"bom.{file_format}")
+        _write_table(table, file_format, delimiter, file_path)
+        expected = _normalize_parse(_timed("parse.reference", _parse_reference, file_path))
+        for name, engine in engines.items():
+            if name == "parse.reference":
+                continue
+            result = _normalize_parse(_timed(name, engine, file_path))
+            assert result == expected, f"{name} disagrees with parse.reference"
+
+# --- Large BOMs ---
+
+def _large_bom_pair(size, seed=1234):
+    rng = random.Random(seed)
+    master = [
+        BOMItem(
+            MPN=f"P{rng.randrange(size * 2):07d}",
+            Quantity=rng.randint(0, 50),
+            RefDes=[f"R{rng.randint(1, 999)}" for _ in range(rng.randint(0, 3))],
+            Description=rng.choice(["Resistor 10k 1%", "CAP 100nF 50V", "LED red 0603", ""]),
+        )
+        for _ in range(size)
+    ]
+    target = []
+    for item in master:
+        roll = rng.random()
+        if roll < 0.05:
+            continue
+        if roll < 0.10:
+            item = dict(item, Quantity=item['Quantity'] + 1)
+        elif roll < 0.12:
+            item = dict(item, MPN=item['MPN'].lower())
+        target.append(item)
+    target += [BOMItem(MPN=f"N{i:06d}", Quantity=1, RefDes=[], Description="") for i in range(size // 20)]
+    return master, target
+
+def test_large_bom_engines_agree(tmp_path, record_property):
+    master, target = _large_bom_pair(20000)
+    options = {"fuzzy_mpn": False, "description_mode": "exact"}
+
+    results = {}
+    for name, (engine, supports) in COMPARE_ENGINES.items():
+        if not supports(options):
+            continue
+        start = time.perf_counter()
+        results[name] = _normalize(engine(master, target, options, str(tmp_path)))
+        record_property(f"{name}_seconds", round(time.perf_counter() - start, 4))
+
+    file_path = str(tmp_path / "large.csv")
+    _write_table([["MPN", "Qty", "RefDes", "Description"]] + [
+        [item['MPN'], str(item['Quantity']), ",".join(item['RefDes']), item['Description']] for item in master
+    ], "csv", ",", file_path)
+    parsed = {}
+    for name, engine in {**PARSE_ENGINES, **SLOW_PARSE_ENGINES}.items():
+        start = time.perf_counter()
+        parsed[name] = engine(file_path)
+        record_property(f"{name}_seconds", round(time.perf_counter() - start, 4))
+
+    expected = results.pop("compare.reference")
+    assert all(result == expected for result in results.values())
+    assert all(items == master for items in parsed.values())
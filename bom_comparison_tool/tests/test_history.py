@@ -0,0 +1,78 @@
+import pytest
+import sqlite3
+from bom_comparison_tool.core.comparator import compare_boms
+from bom_comparison_tool.core.history import RevisionStore
+from bom_comparison_tool.core.models import BOMItem
+
+REV_A = [
+    BOMItem(MPN="PART-001", Quantity=10, RefDes=["R1", "R2"], Description="Resistor 10k"),
+    BOMItem(MPN="PART-002", Quantity=5, RefDes=["C1"], Description="Capacitor 100nF"),
+    BOMItem(MPN="PART-003", Quantity=1, RefDes=["U1"], Description="MCU"),
+]
+REV_B = [
+    BOMItem(MPN="PART-001", Quantity=12, RefDes=["R2", "R1"], Description="Resistor 10k"),
+    BOMItem(MPN="PART-002", Quantity=5, RefDes=["C1", "C2"], Description="Capacitor 100nF X7R"),
+    BOMItem(MPN="PART-004", Quantity=2, RefDes=["D1"], Description="Diode"),
+]
+REV_C = [
+    BOMItem(MPN="PART-001", Quantity=12, RefDes=["R1", "R2"], Description="Resistor 10k"),
+]
+
+@pytest.fixture
+def store(tmp_path):
+    with RevisionStore(str(tmp_path / "history.sqlite")) as store:
+        store.ingest_many([("A", REV_A, "a.xlsx"), ("B", REV_B, "b.csv"), ("C", REV_C, None)])
+        yield store
+
+def _sorted(result):
+    return {key: sorted(items, key=lambda item: item['MPN']) for key, items in result.items()}
+
+# Test case for revision diffs matching compare_boms
+def test_diff_matches_compare_boms(store):
+    expected = _sorted(compare_boms(REV_A, REV_B).to_dict())
+
+    assert store.diff("A", "B") == expected
+
+# Test case for cross-revision queries
+def test_history_queries(store):
+    history = store.item_history("PART-001")
+    assert [entry['Quantity'] for entry in history] == [10, 12, 12]
+    assert [entry['quantity_changed'] for entry in history] == [False, True, False]
+    assert len(store.item_history("PART-001", last=2)) == 2
+
+    appearance = store.appearance("PART-002")
+    assert (appearance['first_label'], appearance['last_label'], appearance['revision_count']) == ("A", "B", 2)
+    assert store.appearance("PART-999") is None
+
+    churn = [(entry['label'], entry['added'], entry['removed'], entry['changed']) for entry in store.churn()]
+    assert churn == [("A", 3, 0, 0), ("B", 1, 1, 2), ("C", 0, 2, 0)]
+
+# Test case for re-ingesting an unchanged file
+def test_ingest_skips_unchanged_source(tmp_path):
+    with RevisionStore(str(tmp_path / "history.sqlite")) as store:
+        first = store.ingest("master.xlsx", REV_A, source="a/master.xlsx", skip_unchanged=True)
+        assert store.ingest("master.xlsx", list(REV_A), source="a/master.xlsx", skip_unchanged=True) == first
+        assert len(store.revisions()) == 1
+
+        # Same content from another path, or changed content, is a new revision.
+        other = store.ingest("master.xlsx", REV_A, source="b/master.xlsx", skip_unchanged=True)
+        changed = store.ingest("master.xlsx", REV_B, source="a/master.xlsx", skip_unchanged=True)
+        assert len({first, other, changed}) == 3
+        assert store.revision_id("master.xlsx") == changed
+        assert store.items(first) == store.items(other)
+
+# Test case for opening a store created before content hashes were recorded
+def test_store_migrates_old_schema(tmp_path):
+    db_path = str(tmp_path / "history.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE revisions (id INTEGER PRIMARY KEY AUTOINCREMENT, label TEXT NOT NULL, "
+        "source TEXT, ingested_at TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO revisions (label, source, ingested_at) VALUES ('old', 'old.csv', '2024-01-01')")
+    conn.commit()
+    conn.close()
+
+    with RevisionStore(db_path) as store:
+        store.ingest("old", REV_C, source="old.csv", skip_unchanged=True)
+        assert [revision['label'] for revision in store.revisions()] == ["old", "old"]
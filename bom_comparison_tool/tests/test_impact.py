@@ -0,0 +1,109 @@
+import os
+import pytest
+from bom_comparison_tool.core.catalog import open_catalog, INDEX_SUFFIX
+from bom_comparison_tool.core.comparator import compare_boms
+from bom_comparison_tool.core.formatter import format_summary
+from bom_comparison_tool.core.impact import compute_impact
+from bom_comparison_tool.core.models import BOMItem
+
+MASTER = [
+    BOMItem(MPN="PART-001", Quantity=10, RefDes=[], Description="Resistor 10k"),
+    BOMItem(MPN="PART-002", Quantity=5, RefDes=[], Description="Capacitor 100nF"),
+    BOMItem(MPN="PART-003", Quantity=2, RefDes=[], Description="Diode"),
+    BOMItem(MPN="PART-004", Quantity=1, RefDes=[], Description="Connector"),
+]
+TARGET = [
+    BOMItem(MPN="PART-001", Quantity=10, RefDes=[], Description="Resistor 10k"),
+    BOMItem(MPN="PART-002", Quantity=8, RefDes=[], Description="Capacitor 100nF"),
+    BOMItem(MPN="PART-005", Quantity=4, RefDes=[], Description="LED"),
+    BOMItem(MPN="PART-006", Quantity=1, RefDes=[], Description="Fuse"),
+]
+
+@pytest.fixture
+def catalog_csv(tmp_path):
+    file_path = tmp_path / "catalog.csv"
+    file_path.write_text(
+        "Part Number,Unit Price,Stock\n"
+        "PART-001,0.10,1000\n"
+        "PART-002,0.50,2\n"
+        "PART-003,\"$1,000.00\",5\n"
+        "PART-005,2.00,0\n"
+        "PART-006,n/a,\n",
+        encoding="utf-8"
+    )
+    return str(file_path)
+
+# Test case for indexing a CSV catalog once and looking parts up
+def test_catalog_index_and_lookup(catalog_csv):
+    with open_catalog(catalog_csv) as catalog:
+        assert len(catalog) == 5
+        assert catalog.lookup("PART-003").unit_cost == 1000.0
+        assert catalog.lookup("PART-999") is None
+        entries = catalog.lookup_many(["PART-006", "PART-999"])
+        assert list(entries) == ["PART-006"]
+        assert entries["PART-006"].unit_cost is None and entries["PART-006"].stock is None
+
+    # The index is now a SQLite catalog that can be opened directly.
+    with open_catalog(catalog_csv + INDEX_SUFFIX) as catalog:
+        assert catalog.lookup("PART-001").stock == 1000
+
+# Test case for a catalog replaced by a file with an older modification time
+def test_catalog_reindexed_when_replaced(catalog_csv):
+    with open_catalog(catalog_csv) as catalog:
+        assert catalog.lookup("PART-001").unit_cost == 0.10
+
+    # Same size, new price, and an mtime older than the index (as with cp -p).
+    with open(catalog_csv, encoding="utf-8") as f:
+        replaced = f.read().replace("PART-001,0.10", "PART-001,0.90")
+    with open(catalog_csv, "w", encoding="utf-8") as f:
+        f.write(replaced)
+    os.utime(catalog_csv, ns=(10**18, 10**18))
+    os.utime(catalog_csv + INDEX_SUFFIX, ns=(2 * 10**18, 2 * 10**18))
+
+    with open_catalog(catalog_csv) as catalog:
+        assert catalog.lookup("PART-001").unit_cost == 0.90
+
+# Test case for cost deltas, out-of-stock additions and unpriced items
+def test_compute_impact(catalog_csv):
+    result = compare_boms(MASTER, TARGET)
+    with open_catalog(catalog_csv) as catalog:
+        impact = compute_impact(result, catalog)
+
+    assert impact['removed_cost'] == pytest.approx(-2000.0)      # PART-003; PART-004 is unpriced
+    assert impact['added_cost'] == pytest.approx(8.0)            # PART-005; PART-006 is unpriced
+    assert impact['quantity_change_cost'] == pytest.approx(1.5)  # PART-002: +3 x 0.50
+    assert impact['total_cost_delta'] == pytest.approx(-1990.5)
+    assert impact['out_of_stock_additions'] == ["PART-002", "PART-005"]
+    assert impact['unpriced'] == ["PART-004", "PART-006"]
+
+    summary = format_summary(result, impact)
+    assert "Total Cost Delta: -1,990.50" in summary
+    assert "Out-of-Stock Additions: PART-002, PART-005" in summary
+
+# Test case for price and stock cells in scientific notation, with currencies or unusable
+def test_catalog_number_formats(tmp_path):
+    file_path = tmp_path / "catalog.csv"
+    file_path.write_text(
+        "MPN,Price,Stock\n"
+        "P1,1e3,1.5E3\n"
+        "P2,1.2E-3,\"2,000\"\n"
+        "P3,USD 0.25,12 pcs\n"
+        "P4,\u20ac -1.50,1e999\n"
+        "P5,\"1,2,3\",--5\n",
+        encoding="utf-8"
+    )
+    with open_catalog(str(file_path)) as catalog:
+        entries = catalog.lookup_many(["P1", "P2", "P3", "P4", "P5"])
+
+    assert (entries["P1"].unit_cost, entries["P1"].stock) == (1000.0, 1500)
+    assert entries["P2"].unit_cost == pytest.approx(0.0012) and entries["P2"].stock == 2000
+    assert (entries["P3"].unit_cost, entries["P3"].stock) == (0.25, None)
+    assert (entries["P4"].unit_cost, entries["P4"].stock) == (-1.5, None)
+    assert (entries["P5"].unit_cost, entries["P5"].stock) == (None, None)
+
+# Test case for a catalog without an MPN column
+def test_catalog_without_mpn_column(tmp_path):
+    file_path = tmp_path / "catalog.csv"
+    file_path.write_text("Price,Stock\n1.0,5\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        open_catalog(str(file_path))
@@ -1,7 +1,12 @@
 import pytest
 import os
+import gzip
+import shutil
+import threading
+import zipfile
 from openpyxl import Workbook
-from bom_comparison_tool.core.parsers import parse_bom_file
+from bom_comparison_tool.core.parsers import parse_bom_file, detect_format, expand_archive_targets
+from bom_comparison_tool.core.isolation import parse_bom_file_isolated
 from bom_comparison_tool.core.models import BOMItem, ErrorDict
 
 # Fixture to create a dummy XLSX file for testing
@@ -68,3 +73,86 @@ def test_parse_file_not_found():
     
     assert 'error' in result # Check if it is an ErrorDict
     assert "File not found" in result['error']
+
+# Test case for the streaming parsers
+def test_parse_streaming_matches_default(dummy_xlsx_file, tmp_path):
+    csv_path = tmp_path / "target.csv"
+    csv_path.write_text("Notes\nPart Number,Qty,Designator,Desc\nPART-001,10,\"R1, R2\",Resistor 10k\n\nPART-002,x,C1,Capacitor\n")
+
+    for file_path in (str(dummy_xlsx_file), str(csv_path)):
+        assert parse_bom_file(file_path, streaming=True) == parse_bom_file(file_path)
+
+# Test case for isolated parsing
+def test_parse_isolated(dummy_xlsx_file):
+    result = parse_bom_file_isolated(str(dummy_xlsx_file))
+
+    assert result == parse_bom_file(str(dummy_xlsx_file))
+
+# Test case for an isolated parse that exceeds its time limit
+def test_parse_isolated_timeout(dummy_xlsx_file):
+    result = parse_bom_file_isolated(str(dummy_xlsx_file), timeout=0.001)
+
+    assert result['kind'] == "timeout"
+    assert result['file_path'] == str(dummy_xlsx_file)
+
+# Test case for an isolated parse whose parser fails under a small memory limit
+# (openpyxl's XML parser reports the failed allocation as a parse error)
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs RLIMIT_AS and /proc")
+def test_parse_isolated_memory_limit():
+    sample_xlsx = os.path.join(os.path.dirname(__file__), os.pardir, "samples", "bom.xlsx")
+    result = parse_bom_file_isolated(sample_xlsx, memory_limit_mb=20)
+
+    assert result['kind'] == "memory"
+    assert "memory limit" in result['error']
+    assert "retried with the streaming parser" in result['error']
+
+# Test case for a cancelled isolated parse
+def test_parse_isolated_cancelled(dummy_xlsx_file):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    result = parse_bom_file_isolated(str(dummy_xlsx_file), cancel_event=cancel_event)
+
+    assert result['kind'] == "cancelled"
+
+# Test case for content-based format detection
+def test_detect_format_from_content(dummy_xlsx_file, tmp_path):
+    mislabeled = tmp_path / "export.csv"
+    shutil.copy(dummy_xlsx_file, mislabeled)
+
+    assert detect_format(str(mislabeled)) == "xlsx"
+    assert parse_bom_file(str(mislabeled)) == parse_bom_file(str(dummy_xlsx_file))
+
+# Test case for gzip-compressed files and zip bundles
+def test_parse_compressed_and_archive_members(dummy_xlsx_file, tmp_path):
+    csv_data = b"MPN,Quantity,RefDes,Description\nPART-001,10,\"R1, R2\",Resistor 10k\nPART-002,5,C1,Capacitor 100nF\n"
+    gz_path = tmp_path / "target.csv.gz"
+    gz_path.write_bytes(gzip.compress(csv_data))
+    bundle_path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(bundle_path, "w") as bundle:
+        bundle.writestr("revs/rev1.csv", csv_data)
+        bundle.writestr("rev2.tsv.gz", gzip.compress(csv_data.replace(b",", b"\t").replace(b'"R1\t R2"', b"R1 R2")))
+        bundle.write(dummy_xlsx_file, "rev3.xlsx")
+
+    expected = parse_bom_file(str(dummy_xlsx_file))
+    assert parse_bom_file(str(gz_path)) == expected
+
+    targets = expand_archive_targets([str(bundle_path), str(gz_path)])
+    assert targets == [
+        f"{bundle_path}::revs/rev1.csv", f"{bundle_path}::rev2.tsv.gz", f"{bundle_path}::rev3.xlsx", str(gz_path)
+    ]
+    for target in targets:
+        assert parse_bom_file(target) == expected
+
+    assert 'error' in parse_bom_file(f"{bundle_path}::missing.csv")
+
+# Test case for a gzip-compressed zip bundle, which cannot be split into members
+def test_compressed_zip_bundle_is_rejected(tmp_path):
+    bundle_path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(bundle_path, "w") as bundle:
+        bundle.writestr("rev1.csv", "MPN,Quantity\nPART-001,10\n")
+    gz_path = tmp_path / "bundle.zip.gz"
+    gz_path.write_bytes(gzip.compress(bundle_path.read_bytes()))
+
+    assert expand_archive_targets([str(gz_path)]) == [str(gz_path)]
+    result = parse_bom_file(str(gz_path))
+    assert "Compressed or nested zip bundles" in result['error']
@@ -0,0 +1,65 @@
+import pytest
+from bom_comparison_tool.core.comparator import compare_boms
+from bom_comparison_tool.core.models import BOMItem
+from bom_comparison_tool.core.snapshot import write_snapshot, open_snapshot, snapshot_matches_source
+
+@pytest.fixture
+def master_items():
+    return [
+        BOMItem(MPN="PART-002", Quantity=5, RefDes=["C1"], Description="Capacitor 100nF"),
+        BOMItem(MPN="PART-001", Quantity=10, RefDes=["R1", "R2"], Description="Resistor 10k"),
+        BOMItem(MPN="PART-003", Quantity=1, RefDes=[], Description="Résistance 4k7 µ"),
+        # Duplicated MPN: the last line wins, as in compare_boms.
+        BOMItem(MPN="PART-002", Quantity=6, RefDes=["C1", "C2"], Description="Capacitor 100nF"),
+    ]
+
+# Test case for round-tripping a BOM through a snapshot
+def test_snapshot_round_trip(tmp_path, master_items):
+    snapshot_path = str(tmp_path / "master.bomsnap")
+    write_snapshot(master_items, snapshot_path)
+
+    with open_snapshot(snapshot_path) as snapshot:
+        assert snapshot.record_count == 4
+        assert list(snapshot.iter_records()) == master_items
+        assert list(snapshot) == ["PART-001", "PART-002", "PART-003"]
+        assert snapshot["PART-002"]['Quantity'] == 6
+        assert snapshot["PART-003"]['Description'] == "Résistance 4k7 µ"
+        assert "PART-999" not in snapshot
+        with pytest.raises(KeyError):
+            snapshot["PART-999"]
+
+# Test case for comparing against a memory-mapped master
+def test_compare_with_snapshot_master(tmp_path, master_items):
+    snapshot_path = str(tmp_path / "master.bomsnap")
+    write_snapshot(master_items, snapshot_path)
+    target = [
+        BOMItem(MPN="PART-001", Quantity=10, RefDes=["R1", "R2"], Description="Resistor 10k"),
+        BOMItem(MPN="PART-002", Quantity=5, RefDes=["C1"], Description="Capacitor 100nF"),
+    ]
+
+    with open_snapshot(snapshot_path) as snapshot:
+        assert compare_boms(snapshot, target).to_dict() == compare_boms(master_items, target).to_dict()
+
+# Test case for opening a file that is not a snapshot
+def test_open_invalid_snapshot(tmp_path):
+    file_path = tmp_path / "not_a_snapshot.bomsnap"
+    file_path.write_bytes(b"x" * 128)
+
+    with pytest.raises(ValueError):
+        open_snapshot(str(file_path))
+
+# Test case for checking a reused snapshot against its master file
+def test_snapshot_matches_source(tmp_path, master_items):
+    master_file = tmp_path / "master.csv"
+    other_file = tmp_path / "other.csv"
+    master_file.write_text("MPN,Qty\nPART-001,10\n", encoding="utf-8")
+    other_file.write_text("MPN,Qty\nPART-001,10\n", encoding="utf-8")
+    snapshot_path = str(tmp_path / "master.bomsnap")
+    write_snapshot(master_items, snapshot_path, source_path=str(master_file))
+
+    assert snapshot_matches_source(snapshot_path, str(master_file))
+    # A different (even older) master file must not reuse the snapshot.
+    assert not snapshot_matches_source(snapshot_path, str(other_file))
+    master_file.write_text("MPN,Qty\nPART-001,12\n", encoding="utf-8")
+    assert not snapshot_matches_source(snapshot_path, str(master_file))
+    assert not snapshot_matches_source(str(tmp_path / "missing.bomsnap"), str(master_file))
@@ -0,0 +1,54 @@
+import os
+import queue
+import sys
+import threading
+import pytest
+
+# main.py and ui_file_selector.py import the core package as top-level "core",
+# as they do when run from the bom_comparison_tool directory.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+main = pytest.importorskip("main")
+from ui_file_selector import ComparisonWorker
+
+PARSE_OPTIONS = {"isolate": False, "timeout": 60.0, "memory_limit_mb": 2048}
+
+@pytest.fixture
+def bom_files(tmp_path):
+    master = tmp_path / "master.csv"
+    master.write_text("MPN,Quantity,RefDes,Description\nPART-001,10,R1,Resistor 10k\nPART-002,5,C1,Capacitor\n")
+    target = tmp_path / "target.csv"
+    target.write_text("MPN,Quantity,RefDes,Description\nPART-001,12,R1,Resistor 10k\nPART-003,1,D1,Diode\n")
+    return str(master), str(target)
+
+def _run_worker(master_file, target_files, cancel_event):
+    messages = queue.Queue()
+    worker = ComparisonWorker(
+        master_file, target_files, messages, cancel_event, main._cancellable_parser(PARSE_OPTIONS)
+    )
+    worker.start()
+    worker.join(120)
+    received = []
+    while not messages.empty():
+        received.append(messages.get_nowait())
+    return worker, received
+
+# Test case for a background comparison run with main's parse callable
+def test_comparison_worker_with_main_parser(bom_files):
+    master_file, target_file = bom_files
+    worker, received = _run_worker(master_file, [target_file, "missing.csv"], threading.Event())
+
+    assert received[-1][0] == "done", received[-1]
+    assert [message[1] for message in received if message[0] == "target_done"] == [target_file, "missing.csv"]
+    first, second = worker.report["comparisons"]
+    assert first["result"].counts()["mismatched_quantity"] == 1
+    assert "error" in second["result"]
+
+# Test case for a run cancelled before its first target
+def test_comparison_worker_cancelled(bom_files):
+    master_file, target_file = bom_files
+    cancel_event = threading.Event()
+    cancel_event.set()
+    worker, received = _run_worker(master_file, [target_file], cancel_event)
+
+    assert received[-1] == ("cancelled", worker.report)
+    assert worker.report["cancelled"] and worker.report["comparisons"] == []
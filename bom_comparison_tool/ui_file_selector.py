@@ -1,6 +1,20 @@
+import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from typing import Tuple, List, Optional
+from tkinter import filedialog, messagebox, ttk
+from typing import Tuple, List, Optional, Dict, Any, Callable, Union
+
+from core.comparator import compare_boms
+from core.formatter import build_comparison_rows, format_summary, status_color
+from core.parsers import expand_archive_targets
+from core.isolation import parse_bom_file_isolated
+from core.result import ComparisonResult
+from core.catalog import PartsCatalog, open_catalog
+from core.impact import compute_impact
+
+# Number of selected target files listed by name in the selector.
+MAX_LISTED_TARGETS = 5
 
 class FileSelectorApp:
     """
@@ -18,7 +32,7 @@ class FileSelectorApp:
 
         # --- Instructions ---
         instructions_text = (
-            "Please select your Master BOM file (XLSX only) and 1 to 5 Target BOM files "
+            "Please select your Master BOM file (XLSX only) and one or more Target BOM files "
             "for comparison. Click 'Compare BOMs' when ready."
         )
         self.instructions_label = tk.Label(master, text=instructions_text, wraplength=550, justify="left")
@@ -37,7 +51,7 @@ class FileSelectorApp:
         self.master_button.pack(side="right", padx=(10, 0))
 
         # --- Target Files Selection ---
-        self.target_frame = tk.LabelFrame(master, text="Target BOM Files (1-5 files)", padx=10, pady=10)
+        self.target_frame = tk.LabelFrame(master, text="Target BOM Files", padx=10, pady=10)
         self.target_frame.pack(pady=5, padx=20, fill="x")
 
         self.target_label_text = tk.StringVar()
@@ -77,39 +91,50 @@ class FileSelectorApp:
             self.master_file_path = None
 
     def _select_target_files(self):
-        """Opens a file dialog to select 1 to 5 Target BOM files."""
+        """Opens a file dialog to select one or more Target BOM files."""
         filetypes = [
-            ("All supported files", "*.csv *.xlsx *.docx *.pdf *.txt"),
-            ("CSV files", "*.csv"),
-            ("Excel files", "*.xlsx"),
+            ("All supported files", "*.csv *.tsv *.xlsx *.xlsm *.docx *.pdf *.txt *.gz *.zip"),
+            ("CSV/TSV files", "*.csv *.tsv"),
+            ("Excel files", "*.xlsx *.xlsm"),
             ("Word documents", "*.docx"),
             ("PDF files", "*.pdf"),
-            ("Text files", "*.txt")
+            ("Text files", "*.txt"),
+            ("Compressed files and archives", "*.gz *.zip"),
+            ("All files", "*.*")
         ]
         fpaths = filedialog.askopenfilenames(
             parent=self.master,
-            title="Select Target BOM Files (1-5)",
+            title="Select Target BOM Files",
             filetypes=filetypes
         )
         if fpaths:
             self.target_file_paths = list(fpaths)
-            self.target_label_text.set("Selected:\n" + "\n".join(self.target_file_paths))
+            # Only list the first few files; a batch can contain hundreds.
+            shown = self.target_file_paths[:MAX_LISTED_TARGETS]
+            more = len(self.target_file_paths) - len(shown)
+            self.target_label_text.set(
+                f"Selected {len(self.target_file_paths)} file(s):\n" + "\n".join(shown)
+                + (f"\n... and {more} more" if more else "")
+            )
         else:
             self.target_label_text.set("No Target files selected.")
             self.target_file_paths = []
 
-    def _validate_and_submit(self):
-        """Validates selections and closes the window if valid."""
+    def _validate_selection(self) -> bool:
+        """Checks that a master and at least one target file are selected."""
         if not self.master_file_path:
             messagebox.showerror("Validation Error", "Please select a Master BOM file.")
-            return
+            return False
 
         if not self.target_file_paths:
             messagebox.showerror("Validation Error", "Please select at least one Target BOM file.")
-            return
+            return False
 
-        if not (1 <= len(self.target_file_paths) <= 5):
-            messagebox.showerror("Validation Error", "You must select between 1 and 5 Target BOM files.")
+        return True
+
+    def _validate_and_submit(self):
+        """Validates selections and closes the window if valid."""
+        if not self._validate_selection():
             return
         
         self.result_ready = True
@@ -137,6 +162,449 @@ def launch_file_selector() -> Tuple[Optional[str], Optional[List[str]]]:
     else:
         return None, None
 
+# --- Background Comparison with Results View ---
+
+# How often (ms) the UI drains the worker's message queue.
+POLL_INTERVAL_MS = 100
+# How long (seconds) closing the window waits for a cancelled run to stop.
+CLOSE_TIMEOUT = 5.0
+# Maximum number of queued messages handled per poll, so the UI stays responsive.
+MAX_MESSAGES_PER_POLL = 50
+# Lines shown by the results tree until its real height is known, and the
+# number of rows scrolled per mouse wheel step.
+DEFAULT_VISIBLE_ROWS = 20
+WHEEL_SCROLL_ROWS = 3
+
+# Treeview foreground colors matching the console table's highlight colors.
+TREE_COLORS = {"GREEN": "#1a7f37", "YELLOW": "#9a6700", "RED": "#cf222e"}
+
+STATUS_FILTERS = [
+    "All", "Differences only", "OK", "MISSING", "EXTRA", "DIFF QUANTITY",
+    "DIFF DESCRIPTION", "DIFF REFDES", "COSMETIC DESCRIPTION", "LIKELY RENAMED",
+]
+
+def parse_bom_file_cancellable(file_path: str, cancel_event: threading.Event):
+    """Parses a BOM file in a worker process that is killed once `cancel_event` is set."""
+    return parse_bom_file_isolated(file_path, timeout=None, memory_limit_mb=None, cancel_event=cancel_event)
+
+class ComparisonWorker(threading.Thread):
+    """
+    Parses and compares BOM files off the UI thread.
+
+    Progress and results are reported as tuples on a thread-safe queue:
+        ("progress", step, total_steps, message)
+        ("target_done", target_file, comparison_result, rows, impact)
+        ("done", report) / ("cancelled", report) / ("failed", message)
+    The report has the same shape as the JSON report written by main.py and is
+    also available as the `report` attribute while the run is in progress. The
+    impact is None unless a parts catalog was given.
+
+    `parse_file(file_path, cancel_event)` must give up once the event is set;
+    the default parses in a worker process that is killed on cancellation, so
+    a run stops promptly even in the middle of a large file.
+    """
+    def __init__(
+        self,
+        master_file: str,
+        target_files: List[str],
+        messages: "queue.Queue",
+        cancel_event: threading.Event,
+        parse_file: Callable[[str, threading.Event], Any] = parse_bom_file_cancellable,
+        compare_options: Optional[Dict[str, Any]] = None,
+        catalog_path: Optional[str] = None,
+    ):
+        super().__init__(daemon=True)
+        self.master_file = master_file
+        self.target_files = target_files
+        self.messages = messages
+        self.cancel_event = cancel_event
+        self.parse_file = parse_file
+        self.compare_options = compare_options or {}
+        self.catalog_path = catalog_path
+        self.report: Dict[str, Any] = {"master_source": master_file, "comparisons": []}
+
+    def run(self):
+        try:
+            # The catalog's SQLite connection must be opened on this thread.
+            if self.catalog_path:
+                with open_catalog(self.catalog_path) as catalog:
+                    self._run(catalog)
+            else:
+                self._run(None)
+        except Exception as e:
+            self.messages.put(("failed", f"Unexpected error: {e}"))
+
+    def _cancelled(self) -> bool:
+        """Reports the partial run as cancelled if the cancel event is set."""
+        if not self.cancel_event.is_set():
+            return False
+        self.report["cancelled"] = True
+        self.messages.put(("cancelled", self.report))
+        return True
+
+    def _run(self, catalog: Optional[PartsCatalog]):
+        report = self.report
+        # Zip bundles become one target per member.
+        target_files = expand_archive_targets(self.target_files)
+        total_steps = len(target_files) + 1
+
+        self.messages.put(("progress", 0, total_steps, f"Parsing master: {os.path.basename(self.master_file)}"))
+        master_bom = self.parse_file(self.master_file, self.cancel_event)
+        if self._cancelled():
+            return
+        if 'error' in master_bom:
+            self.messages.put(("failed", f"Could not parse master file. Reason: {master_bom['error']}"))
+            return
+
+        for step, target_file in enumerate(target_files, start=1):
+            self.messages.put(("progress", step, total_steps, f"Processing: {os.path.basename(target_file)}"))
+            target_bom = self.parse_file(target_file, self.cancel_event)
+            # A parse abandoned part-way is not a result; leave it out of the report.
+            if self._cancelled():
+                return
+            if 'error' in target_bom:
+                result = {"error": target_bom['error']}
+                if 'kind' in target_bom:
+                    result["kind"] = target_bom['kind']
+                rows = impact = None
+            else:
+                result = compare_boms(master_bom, target_bom, **self.compare_options)
+                rows = build_comparison_rows(result)
+                impact = compute_impact(result, catalog) if catalog else None
+
+            comparison_entry = {"target_file": target_file, "result": result}
+            if impact is not None:
+                comparison_entry["impact"] = impact
+            report["comparisons"].append(comparison_entry)
+            self.messages.put(("target_done", target_file, result, rows, impact))
+
+        self.messages.put(("progress", total_steps, total_steps, "Comparison complete."))
+        self.messages.put(("done", report))
+
+class VirtualTreeview:
+    """
+    A ttk.Treeview that only holds the rows it shows.
+
+    The tree keeps a fixed window of items, one per visible line, and a separate
+    scrollbar maps to a row offset into the full list of rows. Scrolling rewrites
+    the window's values in place, so the widget costs the same for a hundred rows
+    as for a million.
+    """
+    def __init__(self, parent: tk.Widget, columns: List[Tuple[str, str, int]], visible_rows: int = DEFAULT_VISIBLE_ROWS):
+        self._rows: List[Tuple[Tuple, str]] = []
+        self._offset = 0
+        self._window: List[str] = []  # Treeview item ids, top to bottom
+
+        self.frame = tk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=[key for key, _, _ in columns], show="headings", height=visible_rows)
+        for key, heading, width in columns:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor="w")
+        for color, foreground in TREE_COLORS.items():
+            self.tree.tag_configure(color, foreground=foreground)
+
+        # The scrollbar drives the row offset, not the tree's own yview.
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Configure>", self._on_resize)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+
+        self._resize_window(visible_rows)
+
+    def set_rows(self, rows: List[Tuple[Tuple, str]]):
+        """Replaces the content with (values, tag) rows and shows the first of them."""
+        self._rows = rows
+        self._offset = 0
+        self._render()
+
+    def scroll_to(self, offset: int):
+        """Shows the rows starting at `offset` (clamped to the valid range)."""
+        self._offset = offset
+        self._render()
+
+    def _resize_window(self, size: int):
+        size = max(size, 1)
+        while len(self._window) < size:
+            self._window.append(self.tree.insert("", "end"))
+        if len(self._window) > size:
+            self.tree.delete(*self._window[size:])
+            del self._window[size:]
+        self._render()
+
+    def _render(self):
+        total = len(self._rows)
+        self._offset = min(max(self._offset, 0), max(total - len(self._window), 0))
+        self.tree.selection_remove(*self.tree.selection())
+        for position, item in enumerate(self._window):
+            index = self._offset + position
+            if index < total:
+                values, tag = self._rows[index]
+                self.tree.item(item, values=values, tags=(tag,))
+            else:
+                self.tree.item(item, values=(), tags=())
+        if total > len(self._window):
+            self.scrollbar.set(self._offset / total, (self._offset + len(self._window)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_resize(self, event):
+        """Matches the window of items to the number of lines that fit."""
+        bbox = self.tree.bbox(self._window[0])
+        if not bbox:
+            return
+        _, header_height, _, row_height = bbox
+        visible_rows = (event.height - header_height) // row_height
+        if visible_rows != len(self._window):
+            self._resize_window(visible_rows)
+
+    def _on_scrollbar(self, action: str, *args):
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * len(self._rows)))
+        elif action == "scroll":
+            step = len(self._window) if args[1] == "pages" else 1
+            self.scroll_to(self._offset + int(args[0]) * step)
+
+    def _on_wheel(self, event):
+        # Button-4/5 on X11; a signed delta elsewhere.
+        direction = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        self.scroll_to(self._offset + direction * WHEEL_SCROLL_ROWS)
+        return "break"
+
+class ComparisonApp(FileSelectorApp):
+    """
+    File selection plus background comparison, progress and a results view.
+
+    Parsing and comparison run in a ComparisonWorker thread; the UI polls its
+    message queue with after(). Stop (or closing the window) cancels the run,
+    including a parse in progress, and keeps the report of the files already
+    compared.
+    """
+    def __init__(
+        self,
+        master: tk.Tk,
+        parse_file: Callable[[str, threading.Event], Any] = parse_bom_file_cancellable,
+        compare_options: Optional[Dict[str, Any]] = None,
+        catalog_path: Optional[str] = None,
+    ):
+        super().__init__(master)
+        master.title("BOM Comparison")
+        master.geometry("1000x750")
+        master.resizable(True, True)
+
+        self.parse_file = parse_file
+        self.compare_options = compare_options or {}
+        self.catalog_path = catalog_path
+        self.report: Optional[Dict[str, Any]] = None
+        self._messages: "queue.Queue" = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._worker: Optional[ComparisonWorker] = None
+        # Results keyed by their label in the target selector.
+        # Values are (result, rows, impact).
+        self._results: Dict[str, Tuple[Union[ComparisonResult, Dict[str, Any]], Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]]]] = {}
+        self._filter_job = None
+
+        # --- Action Buttons (reused from the selector) ---
+        self.compare_button.configure(command=self._start_comparison)
+        self.cancel_button.configure(text="Close")
+        self.stop_button = tk.Button(self.button_frame, text="Stop", command=self._cancel_comparison, width=15, height=2, state="disabled")
+        self.stop_button.pack(side="left", padx=10)
+
+        # --- Progress ---
+        self.progress_frame = tk.Frame(master)
+        self.progress_frame.pack(padx=20, fill="x")
+        self.progress = ttk.Progressbar(self.progress_frame, mode="determinate")
+        self.progress.pack(fill="x")
+        self.status_text = tk.StringVar(value="Select files and click 'Compare BOMs'.")
+        tk.Label(self.progress_frame, textvariable=self.status_text, anchor="w").pack(fill="x")
+
+        # --- Results ---
+        self.results_frame = tk.LabelFrame(master, text="Results", padx=10, pady=10)
+        self.results_frame.pack(pady=10, padx=20, fill="both", expand=True)
+
+        controls = tk.Frame(self.results_frame)
+        controls.pack(fill="x")
+        tk.Label(controls, text="Target:").pack(side="left")
+        self.target_var = tk.StringVar()
+        self.target_combo = ttk.Combobox(controls, textvariable=self.target_var, state="readonly", width=40)
+        self.target_combo.bind("<<ComboboxSelected>>", lambda event: self._show_selected_target())
+        self.target_combo.pack(side="left", padx=(5, 15))
+
+        tk.Label(controls, text="Show:").pack(side="left")
+        self.filter_var = tk.StringVar(value=STATUS_FILTERS[0])
+        self.filter_combo = ttk.Combobox(controls, textvariable=self.filter_var, values=STATUS_FILTERS, state="readonly", width=22)
+        self.filter_combo.bind("<<ComboboxSelected>>", lambda event: self._apply_filter())
+        self.filter_combo.pack(side="left", padx=(5, 15))
+
+        tk.Label(controls, text="MPN contains:").pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self._schedule_filter())
+        tk.Entry(controls, textvariable=self.search_var, width=20).pack(side="left", padx=5)
+
+        self.summary_text = tk.StringVar()
+        tk.Label(self.results_frame, textvariable=self.summary_text, justify="left", anchor="w").pack(fill="x", pady=5)
+
+        self.results_view = VirtualTreeview(self.results_frame, [
+            ("mpn", "MPN", 250),
+            ("master_qty", "Master Qty", 90),
+            ("target_qty", "Target Qty", 90),
+            ("status", "Status", 400),
+        ])
+        self.results_view.frame.pack(fill="both", expand=True)
+
+    # --- Running the comparison ---
+
+    def _start_comparison(self):
+        """Validates the selection and starts a background comparison run."""
+        if self._worker is not None or not self._validate_selection():
+            return
+
+        self._results.clear()
+        self.target_combo.configure(values=[])
+        self.target_var.set("")
+        self.summary_text.set("")
+        self.results_view.set_rows([])
+        self.progress.configure(value=0, maximum=len(self.target_file_paths) + 1)
+
+        self._cancel_event.clear()
+        self._worker = ComparisonWorker(
+            self.master_file_path, list(self.target_file_paths), self._messages,
+            self._cancel_event, self.parse_file, self.compare_options, self.catalog_path
+        )
+        self._set_running(True)
+        self._worker.start()
+        self.master.after(POLL_INTERVAL_MS, self._poll_queue)
+
+    def _cancel_comparison(self):
+        """Asks the worker to stop, abandoning the file it is processing."""
+        if self._worker is not None:
+            self._cancel_event.set()
+            self.status_text.set("Cancelling...")
+
+    def _set_running(self, running: bool):
+        self.compare_button.configure(state="disabled" if running else "normal")
+        self.master_button.configure(state="disabled" if running else "normal")
+        self.target_button.configure(state="disabled" if running else "normal")
+        self.stop_button.configure(state="normal" if running else "disabled")
+
+    def _poll_queue(self):
+        """Handles messages from the worker; reschedules itself while it runs."""
+        for _ in range(MAX_MESSAGES_PER_POLL):
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_message(message)
+
+        if self._worker is not None:
+            self.master.after(POLL_INTERVAL_MS, self._poll_queue)
+
+    def _handle_message(self, message: Tuple):
+        kind = message[0]
+        if kind == "progress":
+            _, step, total_steps, text = message
+            self.progress.configure(value=step, maximum=total_steps)
+            self.status_text.set(text)
+        elif kind == "target_done":
+            _, target_file, result, rows, impact = message
+            self._add_target_result(target_file, result, rows, impact)
+        elif kind in ("done", "cancelled"):
+            self.report = message[1]
+            self._finish("Comparison complete." if kind == "done" else "Comparison cancelled.")
+        elif kind == "failed":
+            self._finish(message[1])
+            messagebox.showerror("Comparison Error", message[1], parent=self.master)
+
+    def _finish(self, status: str):
+        self._worker = None
+        self._set_running(False)
+        self.status_text.set(status)
+
+    # --- Results view ---
+
+    def _add_target_result(
+        self, target_file: str, result: Union[ComparisonResult, Dict[str, Any]],
+        rows: Optional[List[Dict[str, Any]]], impact: Optional[Dict[str, Any]] = None
+    ):
+        label = f"{len(self._results) + 1}. {os.path.basename(target_file)}"
+        self._results[label] = (result, rows, impact)
+        self.target_combo.configure(values=list(self._results))
+        if not self.target_var.get():
+            self.target_var.set(label)
+            self._show_selected_target()
+
+    def _show_selected_target(self):
+        if self.target_var.get() not in self._results:
+            return
+        result, _, impact = self._results[self.target_var.get()]
+        if isinstance(result, dict):
+            self.summary_text.set(f"Error parsing target file: {result['error']}")
+        else:
+            self.summary_text.set(format_summary(result, impact))
+        self._apply_filter()
+
+    def _schedule_filter(self):
+        """Re-filters shortly after the user stops typing."""
+        if self._filter_job is not None:
+            self.master.after_cancel(self._filter_job)
+        self._filter_job = self.master.after(250, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        _, rows, _ = self._results.get(self.target_var.get(), (None, None, None))
+        if not rows:
+            self.results_view.set_rows([])
+            return
+
+        status_filter = self.filter_var.get()
+        search = self.search_var.get().strip().upper()
+        visible = []
+        for row in rows:
+            if search and search not in row['MPN'].upper():
+                continue
+            color = status_color(row['statuses'])
+            if status_filter == "Differences only":
+                if color == 'GREEN':
+                    continue
+            elif status_filter != "All" and not any(s.startswith(status_filter) for s in row['statuses']):
+                continue
+            visible.append(((row['MPN'], row['master_qty'], row['target_qty'], ', '.join(row['statuses'])), color))
+        self.results_view.set_rows(visible)
+
+    def _on_closing(self):
+        """Stops any running comparison, keeps its partial report, and closes the window."""
+        self._cancel_event.set()
+        if self._worker is not None:
+            self._worker.join(CLOSE_TIMEOUT)
+            self.report = self._worker.report
+            self.report["cancelled"] = True
+        super()._on_closing()
+
+def launch_comparison_app(
+    parse_file: Callable[[str, threading.Event], Any] = parse_bom_file_cancellable,
+    compare_options: Optional[Dict[str, Any]] = None,
+    catalog_path: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Launches the interactive comparison window.
+
+    Args:
+        parse_file: The function used to parse each BOM file, called as
+            parse_file(file_path, cancel_event) (see ComparisonWorker).
+        compare_options: Keyword arguments passed to compare_boms().
+        catalog_path: Optional parts catalog used to add cost impact to each summary.
+
+    Returns:
+        The report of the last comparison run (same shape as the JSON report),
+        or None if no comparison was run. A run that was stopped or interrupted
+        by closing the window returns its partial report, marked "cancelled".
+    """
+    root = tk.Tk()
+    app = ComparisonApp(root, parse_file, compare_options, catalog_path)
+    root.mainloop() # This blocks until the window is closed
+    return app.report
+
 if __name__ == "__main__":
     # Example usage when run directly
     master, targets = launch_file_selector()